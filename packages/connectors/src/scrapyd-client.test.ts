@@ -0,0 +1,51 @@
+import { afterEach, describe, expect, test, vi } from 'vitest';
+
+import { ScrapydClient, expandCompactFeed, parseFeed } from './scrapyd-client';
+
+const source = {
+  url: 'https://data.example.gov/overages/listing',
+  fetched_at: '2024-03-01T08:00:00+00:00',
+  raw_sha256: 'a'.repeat(64)
+};
+
+const compactFeed = [
+  { source_id: '0', source },
+  { normalized_case: { case_ref: 'C1' }, source_ref: '0' },
+  { normalized_case: { case_ref: 'C2' }, source_ref: '0' }
+]
+  .map((record) => JSON.stringify(record))
+  .join('\n');
+
+describe('compact feeds', () => {
+  test('expands source references back to full items', () => {
+    expect(parseFeed(compactFeed)).toEqual([
+      { normalized_case: { case_ref: 'C1' }, source },
+      { normalized_case: { case_ref: 'C2' }, source }
+    ]);
+  });
+
+  test('passes plain JSON arrays through unchanged', () => {
+    const items = [{ normalized_case: { case_ref: 'C1' }, source }];
+    expect(parseFeed(JSON.stringify(items))).toEqual(items);
+    expect(parseFeed('')).toEqual([]);
+  });
+
+  test('rejects references without a header', () => {
+    expect(() => expandCompactFeed([{ normalized_case: {}, source_ref: '9' }])).toThrow('source_ref 9');
+  });
+});
+
+describe('ScrapydClient.fetchItems', () => {
+  afterEach(() => {
+    vi.unstubAllGlobals();
+  });
+
+  test('expands a compact job feed', async () => {
+    vi.stubGlobal('fetch', vi.fn().mockResolvedValue(new Response(compactFeed)));
+
+    const items = await new ScrapydClient('http://scrapyd.test').fetchItems('job-1');
+
+    expect(items).toHaveLength(2);
+    expect(items[1]).toEqual({ normalized_case: { case_ref: 'C2' }, source });
+  });
+});
@@ -1,5 +1,7 @@
 import { ConnectorScrapedItem } from './types';
 
+type FeedRecord = Record<string, unknown>;
+
 interface ScheduleResponse {
   status: 'ok' | 'error';
   jobid?: string;
@@ -35,7 +37,7 @@ export class ScrapydClient {
     try {
       const response = await fetch(`${this.baseUrl}/items/${this.project}/${jobId}.json`);
       if (!response.ok) return [];
-      return ((await response.json()) ?? []) as ConnectorScrapedItem[];
+      return parseFeed(await response.text()) as unknown as ConnectorScrapedItem[];
     } catch (error) {
       if (error instanceof Error) {
         throw new Error(`Unable to fetch items for job ${jobId}: ${error.message}`);
@@ -44,3 +46,43 @@ export class ScrapydClient {
     }
   }
 }
+
+/**
+ * Restores the full item shape from a compact feed (SCRAPY_FEED_FORMAT=jsonlines_compact),
+ * where each artifact's source block is written once as a `{ source_id, source }` header and
+ * items carry `source_ref`. Records that already carry `source` pass through unchanged.
+ */
+export function expandCompactFeed(records: FeedRecord[]): FeedRecord[] {
+  const sources = new Map<string, unknown>();
+  const items: FeedRecord[] = [];
+
+  for (const record of records) {
+    if (typeof record.source_id === 'string') {
+      sources.set(record.source_id, record.source);
+    } else if (typeof record.source_ref === 'string') {
+      if (!sources.has(record.source_ref)) {
+        throw new Error(`source_ref ${record.source_ref} has no preceding header`);
+      }
+      items.push({ normalized_case: record.normalized_case, source: sources.get(record.source_ref) });
+    } else {
+      items.push(record);
+    }
+  }
+
+  return items;
+}
+
+/** Parses a feed written as a JSON array or as JSON lines, expanding compact records. */
+export function parseFeed(body: string): FeedRecord[] {
+  const trimmed = body.trim();
+  if (!trimmed) return [];
+
+  const records = trimmed.startsWith('[')
+    ? ((JSON.parse(trimmed) ?? []) as FeedRecord[])
+    : trimmed
+        .split('\n')
+        .filter((line) => line.trim())
+        .map((line) => JSON.parse(line) as FeedRecord);
+
+  return expandCompactFeed(records);
+}
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import time
+from typing import Callable, List
+
+from scrapy.exporters import JsonLinesItemExporter
+
+from surplus_scraper.exporters import CompactJsonLinesItemExporter, expand_compact_feed
+
+SOURCE = {
+    "url": "https://data.example.gov/overages/listing",
+    "fetched_at": "2024-03-01T08:00:00+00:00",
+    "raw_sha256": "9f" * 32,
+    "artifact_key": "overages/2024-03-01.csv",
+}
+
+
+def build_items(rows: int) -> List[dict]:
+    return [
+        {
+            "normalized_case": {
+                "case_ref": f"CSV-{index}",
+                "state": "TX",
+                "county_code": "201",
+                "source_system": "csv_feed_overages",
+                "filed_at": "2024-02-10",
+                "status": "open",
+                "parties": [{"role": "owner", "name": f"Owner {index}"}],
+                "amounts": [{"type": "surplus", "amount": float(index % 9000), "currency": "USD"}],
+            },
+            "source": SOURCE,
+        }
+        for index in range(rows)
+    ]
+
+
+def export(exporter_cls, items: List[dict]) -> bytes:
+    buffer = io.BytesIO()
+    exporter = exporter_cls(buffer)
+    exporter.start_exporting()
+    for item in items:
+        exporter.export_item(item)
+    exporter.finish_exporting()
+    return buffer.getvalue()
+
+
+def parse_plain(lines: List[bytes]) -> int:
+    return sum(1 for line in lines if json.loads(line))
+
+
+def parse_compact(lines: List[bytes]) -> int:
+    return sum(1 for _ in expand_compact_feed(lines))
+
+
+def timed(label: str, fn: Callable[[List[bytes]], int], body: bytes, repeat: int) -> None:
+    lines = body.splitlines()
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        count = fn(lines)
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:<10} rows={count:<8} size={len(body) / 1_048_576:.1f} MiB parse={best:.3f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare plain and compact JSON lines feeds")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    items = build_items(args.rows)
+    timed("jsonlines", parse_plain, export(JsonLinesItemExporter, items), args.repeat)
+    timed("compact", parse_compact, export(CompactJsonLinesItemExporter, items), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
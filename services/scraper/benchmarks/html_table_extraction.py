@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable
+
+from parsel import Selector
+
+from surplus_scraper.html_tables import iter_table_rows
+from surplus_scraper.spiders.html_table import HtmlTableSpider
+
+
+def build_table(rows: int) -> bytes:
+    body = [
+        "<html><body><table id=\"overages\"><thead><tr>",
+        "<th>Parcel</th><th>Owner</th><th>Address</th><th>Amount</th><th>Sale Date</th>",
+        "</tr></thead><tbody>",
+    ]
+    for index in range(rows):
+        body.append(
+            f"<tr><td>R{index}</td><td>Owner {index}</td><td>{index} Main St, Austin, TX 78701</td>"
+            f"<td>${index % 9000}.50</td><td>2024-03-01</td></tr>"
+        )
+    body.append("</tbody></table></body></html>")
+    return "".join(body).encode()
+
+
+def parsel_rows(body: bytes) -> int:
+    count = 0
+    for row in Selector(body=body, type="html").css("table#overages tbody tr"):
+        cells = [cell.strip() for cell in row.css("td::text").getall()]
+        if len(cells) >= 5:
+            count += 1
+    return count
+
+
+def streaming_rows(body: bytes) -> int:
+    rows = iter_table_rows(body, table_id=HtmlTableSpider.table_id, columns=HtmlTableSpider.table_columns)
+    return sum(1 for _ in rows)
+
+
+def timed(label: str, fn: Callable[[bytes], int], body: bytes, repeat: int) -> None:
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        count = fn(body)
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:<10} rows={count:<8} best={best:.3f}s rows/s={count / best:,.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare parsel and streaming HTML table extraction")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    body = build_table(args.rows)
+    print(f"document size={len(body) / 1_048_576:.1f} MiB")
+    timed("parsel", parsel_rows, body, args.repeat)
+    timed("streaming", streaming_rows, body, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
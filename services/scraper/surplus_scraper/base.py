@@ -3,16 +3,33 @@ from __future__ import annotations
 import hashlib
 import json
 import os
+import threading
 import time
+import weakref
+from collections import Counter
 from dataclasses import dataclass, asdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional
 
 import scrapy
 from scrapy.http import Request, Response
 
+from surplus_scraper.deadletter import DeadLetterSink, DeadLetterThresholdExceeded, RowErrorBudget
+from surplus_scraper.host_health import OPEN, HostHealthTracker
+from surplus_scraper.identity import IdentityIndex, identity_keys
 from surplus_scraper.items import NormalizedCaseResult, SourceMetadata
+from surplus_scraper.pagination import PaginatedWatch, PaginationRun
+from surplus_scraper.sharding import HashRing, shard_state_dir
+from surplus_scraper.tail import check_digest, parse_content_range, range_start
+from surplus_scraper.yield_history import YieldHistory
+from surplus_scraper.parse_pool import (
+    ParsePool,
+    parse_artifact_in_process,
+    replay_outcomes,
+    serialize_response,
+    take_outcomes,
+)
 
 
 @dataclass
@@ -21,6 +38,11 @@ class Cursor:
     last_modified: Optional[str] = None
     list_fingerprint: Optional[str] = None
     artifact_sha256: Optional[str] = None
+    append_offset: Optional[int] = None
+    append_check_sha256: Optional[str] = None
+    append_preamble: Optional[str] = None
+    # Rows or listing entries on a paginated page; 0 marks the end of the listing.
+    page_rows: Optional[int] = None
 
     def as_headers(self) -> dict:
         headers: dict[str, str] = {}
@@ -49,10 +71,84 @@ class BaseSpider(scrapy.Spider):
     watch_urls: List[str] = []
     state_dir_env = "SCRAPER_STATE_DIR"
 
+    # Watches are split across shard_count workers by consistent hashing of
+    # the watch URL; pass -a shard_index=N -a shard_count=M per worker.
+    shard_index: int = 0
+    shard_count: int = 1
+
+    # Multi-page listings; each page keeps its own cursor keyed by page URL.
+    paginated_watches: List[PaginatedWatch] = []
+    pagination_concurrency: int = 4
+    pagination_leading_pages: int = 2
+
+    # Items and surplus amounts emitted per watch are kept for the last
+    # yield_history_window crawls; with yield_priority the next crawl fetches
+    # the highest-yield watches first via Scrapy request priorities.
+    yield_priority: bool = True
+    yield_history_window: int = 10
+
+    # Append-only artifacts are resumed with a Range request from the last
+    # offset; append_check_bytes before it are re-fetched to detect rewrites.
+    append_only: bool = False
+    append_check_bytes: int = 4096
+
+    # Cross-source duplicate detection shared by every spider under the state
+    # root: "annotate" adds metadata.duplicate_of, "suppress" drops the item,
+    # "off" disables the index. A bloom capacity of 0 disables the pre-check.
+    identity_index_mode: str = "annotate"
+    identity_index_path: str = ""
+    identity_bloom_capacity: int = 10_000_000
+
+    # Per-job budgets enforced by extensions.BudgetWatchdog (0 = unlimited);
+    # BUDGET_* settings take precedence.
+    budget_max_bytes: int = 0
+    budget_max_items: int = 0
+    budget_max_rss_mb: float = 0.0
+    budget_max_seconds: float = 0.0
+
+    # Per-host circuit breaker applied by middlewares.HostHealthMiddleware:
+    # after host_failure_threshold consecutive failures a host is skipped for
+    # host_backoff_seconds, doubling per re-open up to host_max_backoff_seconds.
+    # A threshold of 0 disables it.
+    host_failure_threshold: int = 3
+    host_backoff_seconds: float = 1800.0
+    host_max_backoff_seconds: float = 86400.0
+
+    # Opt-in worker pool for parse/fingerprint/validate; each attribute can be
+    # overridden by the matching PARSE_POOL_* setting. Needs the asyncio reactor.
+    parse_in_pool: bool = False
+    parse_pool_kind: str = "thread"
+    parse_pool_size: int = 4
+    parse_pool_max_pending: int = 2
+    parse_pool_batch_size: int = 500
+
+    # Invalid rows are quarantined to a JSONL dead-letter file; an artifact is
+    # aborted once more than dead_letter_max_error_rate of its rows (after at
+    # least dead_letter_min_rows) are invalid. Paths accept %(name)s.
+    dead_letter_path: str = ""
+    dead_letter_max_error_rate: float = 0.5
+    dead_letter_min_rows: int = 20
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        state_root = Path(os.environ.get(self.state_dir_env, Path(__file__).parent / ".state"))
-        self.state_dir = state_root / self.name
+        self._init_kwargs = dict(kwargs)
+        self._parse_pool: Optional[ParsePool] = None
+        self._dead_letter_sink: Optional[DeadLetterSink] = None
+        self._row_budgets: dict[str, RowErrorBudget] = {}
+        self._pending_stats: Counter[str] = Counter()
+        self._identity_index: Optional[IdentityIndex] = None
+        self._worker_state = threading.local()
+        self._host_health: Optional[HostHealthTracker] = None
+        self._yield_history: Optional[YieldHistory] = None
+        self._yield_priorities: Dict[str, int] = {}
+        self._artifact_sources: weakref.WeakKeyDictionary[Response, tuple[str, str]] = weakref.WeakKeyDictionary()
+        self.shard_index = int(self.shard_index)
+        self.shard_count = int(self.shard_count)
+        self._ring = HashRing(self.shard_count)
+        if not 0 <= self.shard_index < self.shard_count:
+            raise ValueError(f"shard_index must be in [0, {self.shard_count})")
+        self.state_root = Path(os.environ.get(self.state_dir_env, Path(__file__).parent / ".state"))
+        self.state_dir = shard_state_dir(self.state_root / self.name, self.shard_index, self.shard_count)
         self.state_dir.mkdir(parents=True, exist_ok=True)
         self.state_path = self.state_dir / "cursor.json"
         self._cursor_state: dict[str, Cursor] = self._load_state()
@@ -71,21 +167,147 @@ class BaseSpider(scrapy.Spider):
         serializable = {url: asdict(cursor) for url, cursor in self._cursor_state.items()}
         self.state_path.write_text(json.dumps(serializable, indent=2))
 
+    def _commit_cursor(self, url: str, cursor: Cursor) -> None:
+        self._cursor_state[url] = cursor
+        self._save_state()
+
+    # --- option helpers
+    def get_option(self, setting: str, attribute: str) -> Any:
+        default = getattr(self, attribute)
+        settings = getattr(self, "settings", None)
+        if settings is None or settings.get(setting) is None:
+            return default
+        if isinstance(default, bool):
+            return settings.getbool(setting)
+        if isinstance(default, int):
+            return settings.getint(setting)
+        if isinstance(default, float):
+            return settings.getfloat(setting)
+        return settings.get(setting)
+
+    # --- stats helpers
+    def _inc_stat(self, key: str, count: int = 1) -> None:
+        crawler = getattr(self, "crawler", None)
+        if crawler is not None and crawler.stats is not None:
+            crawler.stats.inc_value(key, count, spider=self)
+        else:
+            self._pending_stats[key] += count
+
+    def _drain_stats(self) -> Dict[str, int]:
+        drained = dict(self._pending_stats)
+        self._pending_stats.clear()
+        return drained
+
     # --- request helpers
     def start_requests(self) -> Iterable[Request]:  # type: ignore[override]
-        if self.watch_urls:
-            for url in self.watch_urls:
+        if self.watch_urls or self.paginated_watches:
+            urls = self._ring.select(self.watch_urls, self.shard_index)
+            paginated = [
+                watch for watch in self.paginated_watches if self._ring.shard_for(watch.url) == self.shard_index
+            ]
+            if self.get_option("YIELD_PRIORITY", "yield_priority"):
+                self._yield_priorities = self.yield_history.priorities(urls + [watch.url for watch in paginated])
+                urls.sort(key=lambda url: -self._yield_priorities[url])
+                paginated.sort(key=lambda watch: -self._yield_priorities[watch.url])
+            for url in urls:
                 cursor = self._cursor_state.get(url, Cursor())
                 headers = cursor.as_headers()
-                yield scrapy.Request(url=url, callback=self.parse_watch, headers=headers, cb_kwargs={"cursor": cursor})
+                meta = {}
+                if self.append_only and cursor.append_offset:
+                    start = range_start(cursor.append_offset, self.append_check_bytes)
+                    headers["Range"] = f"bytes={start}-"
+                    # Offsets are positions in the decoded body, so the ranged
+                    # bytes must not be content-encoded.
+                    headers["Accept-Encoding"] = "identity"
+                    meta["handle_httpstatus_list"] = [416]
+                yield scrapy.Request(
+                    url=url,
+                    callback=self.parse_watch,
+                    headers=headers,
+                    meta=meta,
+                    cb_kwargs={"cursor": cursor},
+                    priority=self._yield_priorities.get(url, 0),
+                )
+            for watch in paginated:
+                run = PaginationRun(
+                    watch,
+                    leading_pages=self.get_option("PAGINATION_LEADING_PAGES", "pagination_leading_pages"),
+                    concurrency=self.get_option("PAGINATION_CONCURRENCY", "pagination_concurrency"),
+                )
+                for page in run.start():
+                    yield self._page_request(run, page)
         else:
             yield from super().start_requests()
 
+    def _page_request(self, run: PaginationRun, page: int) -> Request:
+        url = run.watch.page_url(page)
+        cursor = self._cursor_state.get(url, Cursor())
+        self._inc_stat("pagination/pages_requested")
+        return scrapy.Request(
+            url=url,
+            callback=self.parse_page,
+            errback=self.page_failed,
+            headers=cursor.as_headers(),
+            meta={"handle_httpstatus_list": [304, 404], "yield_key": run.watch.url},
+            cb_kwargs={"cursor": cursor, "run": run, "page": page},
+            dont_filter=True,
+            priority=self._yield_priorities.get(run.watch.url, 0),
+        )
+
+    def parse_page(
+        self, response: Response, cursor: Cursor, run: PaginationRun, page: int
+    ) -> Iterable[NormalizedCaseResult | Request]:
+        self.yield_history.touch(run.watch.url)
+        changed = False
+        exhausted = response.status == 404
+        results: List[NormalizedCaseResult] = []
+        try:
+            if response.status == 304:
+                exhausted = cursor.page_rows == 0
+            elif response.status != 404:
+                next_cursor = self._build_cursor(response)
+                if next_cursor.matches(cursor):
+                    exhausted = cursor.page_rows == 0
+                else:
+                    # The end of the listing is judged from the raw page, not
+                    # from how many rows survived validation or deduplication.
+                    budget = RowErrorBudget()
+                    results = list(self._iter_records(response, budget))
+                    next_cursor.page_rows = max(budget.total, len(self.extract_listing_entries(response)))
+                    changed = True
+                    exhausted = next_cursor.page_rows == 0
+                    self._commit_cursor(response.url, next_cursor)
+                    self._inc_stat("pagination/pages_changed")
+        except Exception:
+            yield from self._advance_pagination(run, page, False, False)
+            raise
+        yield from results
+        yield from self._advance_pagination(run, page, changed, exhausted)
+
+    def page_failed(self, failure) -> Iterable[Request]:
+        request = failure.request
+        self.logger.warning("Page request failed for %s: %s", request.url, failure.getErrorMessage())
+        yield from self._advance_pagination(request.cb_kwargs["run"], request.cb_kwargs["page"], False, False)
+
+    def _advance_pagination(self, run: PaginationRun, page: int, changed: bool, exhausted: bool) -> Iterable[Request]:
+        for next_page in run.complete(page, changed, exhausted):
+            yield self._page_request(run, next_page)
+        if run.stopped:
+            self.logger.info("Leading pages unchanged for %s; skipping remaining pages", run.watch.url)
+            self._inc_stat("pagination/early_stops")
+
     def parse_watch(self, response: Response, cursor: Cursor) -> Iterable[NormalizedCaseResult]:
+        self.yield_history.touch(self._yield_key(response))
         if response.status == 304:
             self.logger.info("No change for %s (304)", response.url)
             return []
 
+        if self.append_only and cursor and cursor.append_offset:
+            return self._parse_appended(response, cursor)
+
+        if self.get_option("PARSE_POOL_ENABLED", "parse_in_pool"):
+            return self._parse_watch_pooled(response, cursor)
+
         next_cursor = self._build_cursor(response)
         previous_cursor = cursor
 
@@ -93,27 +315,304 @@ class BaseSpider(scrapy.Spider):
             self.logger.info("No change detected for %s using cursor", response.url)
             return []
 
-        results = list(self.parse_records(response))
-        self._cursor_state[response.url] = next_cursor
-        self._save_state()
+        results = list(self._iter_records(response))
+        self._commit_cursor(response.url, next_cursor)
         return results
 
-    def parse_records(self, response: Response) -> Iterable[NormalizedCaseResult]:
+    async def _parse_watch_pooled(self, response: Response, cursor: Cursor) -> AsyncIterator[NormalizedCaseResult]:
+        pool = self.parse_pool
+        batch_size = self.get_option("PARSE_POOL_BATCH_SIZE", "parse_pool_batch_size")
+        async with pool.slots:
+            if pool.kind == "process":
+                settings = getattr(self, "settings", None)
+                cursor_data, outcomes, stats = await pool.run(
+                    parse_artifact_in_process,
+                    type(self),
+                    self._init_kwargs,
+                    settings.copy_to_dict() if settings is not None else {},
+                    serialize_response(response),
+                    asdict(cursor or Cursor()),
+                )
+                next_cursor = Cursor(**cursor_data)
+                for key, count in stats.items():
+                    self._inc_stat(key, count)
+                if outcomes is None:
+                    self.logger.info("No change detected for %s using cursor", response.url)
+                    return
+                for item in self._iter_records(response, rows=replay_outcomes(self, response, outcomes)):
+                    yield item
+            else:
+                next_cursor = await pool.run(self._build_cursor, response)
+                if cursor and next_cursor.matches(cursor):
+                    self.logger.info("No change detected for %s using cursor", response.url)
+                    return
+                # Only parse_records runs on pool threads; stats, identity and
+                # dead letters are replayed here, one batch at a time.
+                budget = RowErrorBudget()
+                records = iter(self.parse_records(response))
+                done = False
+                while not done:
+                    outcomes, done = await pool.run(take_outcomes, self, records, batch_size)
+                    for item in self._iter_records(response, budget, rows=replay_outcomes(self, response, outcomes)):
+                        yield item
+        self._commit_cursor(response.url, next_cursor)
+
+    # --- append-only helpers
+    def _parse_appended(self, response: Response, cursor: Cursor) -> Iterable[NormalizedCaseResult | Request]:
+        offset = cursor.append_offset or 0
+        start = range_start(offset, self.append_check_bytes)
+        content_range = parse_content_range(self._decode_header(response, b"Content-Range"))
+
+        if response.status == 416:
+            if content_range is not None and content_range.total == offset:
+                self.logger.info("No appended data for %s", response.url)
+                return []
+            return [self._full_fetch_request(response, "range not satisfiable")]
+
+        if response.status == 206:
+            if content_range is None or content_range.start != start:
+                return [self._full_fetch_request(response, "unexpected Content-Range")]
+            window, tail = response.body[: offset - start], response.body[offset - start :]
+        else:
+            # Server ignored the Range header; the full body is here already.
+            window, tail = response.body[start:offset], response.body[offset:]
+
+        if len(window) != offset - start or check_digest(window) != cursor.append_check_sha256:
+            if response.status == 206:
+                return [self._full_fetch_request(response, "prefix rewritten")]
+            self.logger.info("Prefix of %s was rewritten; parsing the full artifact", response.url)
+            self._inc_stat("append/full_fallbacks")
+            return self.parse_watch(response, Cursor())
+
+        if not tail:
+            self.logger.info("No appended data for %s", response.url)
+            return []
+
+        self._inc_stat("append/tail_fetches")
+        self._inc_stat("append/bytes_skipped", start if response.status == 206 else offset)
+        preamble = (cursor.append_preamble or "").encode()
+        tail_response = response.replace(status=200, body=preamble + tail)
+        # Appended rows carry the digest of the bytes the server actually sent,
+        # not of the preamble + tail body they are parsed from.
+        self.build_source_metadata(response)
+        self._artifact_sources[tail_response] = self._artifact_sources[response]
+        results = list(self._iter_records(tail_response))
+
+        next_cursor = Cursor(
+            etag=self._decode_header(response, b"ETag"),
+            last_modified=self._decode_header(response, b"Last-Modified"),
+        )
+        self._attach_append_state(next_cursor, window + tail, offset - len(window), cursor.append_preamble)
+        self._commit_cursor(response.url, next_cursor)
+        return results
+
+    def _full_fetch_request(self, response: Response, reason: str) -> Request:
+        self.logger.info("Falling back to a full fetch of %s: %s", response.url, reason)
+        self._inc_stat("append/full_fallbacks")
+        return scrapy.Request(
+            url=response.url,
+            callback=self.parse_watch,
+            cb_kwargs={"cursor": Cursor()},
+            dont_filter=True,
+            priority=response.request.priority if response.request is not None else 0,
+        )
+
+    def _attach_append_state(
+        self, cursor: Cursor, body: bytes, body_offset: int = 0, preamble: Optional[str] = None
+    ) -> None:
+        # Only resume from a row boundary; a partial last line forces a full fetch next time.
+        if not body.endswith(b"\n"):
+            return
+        cursor.append_offset = body_offset + len(body)
+        cursor.append_check_sha256 = check_digest(body[-self.append_check_bytes :])
+        cursor.append_preamble = preamble if preamble is not None else self.extract_preamble(body)
+
+    def extract_preamble(self, body: bytes) -> str:
+        return ""
+
+    def parse_records(self, response: Response) -> Iterable[Optional[NormalizedCaseResult]]:
         raise NotImplementedError("parse_records must be implemented by subclasses")
 
+    def _iter_records(
+        self,
+        response: Response,
+        budget: Optional[RowErrorBudget] = None,
+        rows: Optional[Iterable[Optional[NormalizedCaseResult]]] = None,
+    ) -> Iterator[NormalizedCaseResult]:
+        if budget is None:
+            budget = RowErrorBudget()
+        self._row_budgets[response.url] = budget
+        yield_key = self._yield_key(response)
+        try:
+            for item in self.parse_records(response) if rows is None else rows:
+                if item is None:
+                    continue
+                budget.valid += 1
+                self._inc_stat("rows/valid")
+                if self._register_identity(item):
+                    self.yield_history.record(yield_key, item.normalized_case)
+                    yield item
+            self._check_row_budget(response.url, budget)
+        finally:
+            self._row_budgets.pop(response.url, None)
+            if self._identity_index is not None:
+                self._identity_index.flush()
+
+    # --- yield helpers
+    @property
+    def yield_history(self) -> YieldHistory:
+        if self._yield_history is None:
+            self._yield_history = YieldHistory(
+                self.state_dir / "yield_history.json",
+                window=self.get_option("YIELD_HISTORY_WINDOW", "yield_history_window"),
+            )
+        return self._yield_history
+
+    @staticmethod
+    def _yield_key(response: Response) -> str:
+        # Pages of a paginated watch are credited to the watch URL.
+        if response.request is None:
+            return response.url
+        return response.request.meta.get("yield_key", response.url)
+
+    # --- identity helpers
+    @property
+    def identity_index(self) -> Optional[IdentityIndex]:
+        if self._identity_index is None and self.get_option("IDENTITY_INDEX_MODE", "identity_index_mode") != "off":
+            configured = self.get_option("IDENTITY_INDEX_PATH", "identity_index_path")
+            path = Path(configured) if configured else self.state_root / "identity_index.sqlite3"
+            self._identity_index = IdentityIndex(
+                path, bloom_capacity=self.get_option("IDENTITY_BLOOM_CAPACITY", "identity_bloom_capacity")
+            )
+        return self._identity_index
+
+    def _register_identity(self, item: NormalizedCaseResult) -> bool:
+        index = self.identity_index
+        if index is None:
+            return True
+        case = item.normalized_case
+        keys = identity_keys(case)
+        if not keys:
+            return True
+        duplicate_of = index.observe(keys, case["case_ref"], case["source_system"])
+        if duplicate_of is None:
+            return True
+
+        self._inc_stat("identity/duplicates")
+        if self.get_option("IDENTITY_INDEX_MODE", "identity_index_mode") == "suppress":
+            self._inc_stat("identity/suppressed")
+            return False
+        case_ref, source_system = duplicate_of
+        duplicate = {"case_ref": case_ref, "source_system": source_system}
+        case["metadata"] = dict(case.get("metadata") or {}, duplicate_of=duplicate)
+        return True
+
+    # --- dead-letter helpers
+    @property
+    def dead_letter_sink(self) -> DeadLetterSink:
+        if self._dead_letter_sink is None:
+            configured = self.get_option("DEAD_LETTER_PATH", "dead_letter_path")
+            path = Path(configured % {"name": self.name}) if configured else self.state_dir / "dead_letter.jsonl"
+            self._dead_letter_sink = DeadLetterSink(path)
+        return self._dead_letter_sink
+
+    @property
+    def _quarantine_buffer(self) -> Optional[List[Any]]:
+        # Per thread, so a pool thread buffering one artifact's rows never
+        # captures rows quarantined elsewhere.
+        return getattr(self._worker_state, "quarantine", None)
+
+    @_quarantine_buffer.setter
+    def _quarantine_buffer(self, buffer: Optional[List[Any]]) -> None:
+        self._worker_state.quarantine = buffer
+
+    def quarantine(self, response: Response, row: Any, reason: str) -> None:
+        if self._quarantine_buffer is not None:
+            # Parse-pool worker: the reactor thread writes it.
+            self._quarantine_buffer.append(("quarantined", row, reason))
+            return
+        case_ref = row.get("case_ref") if isinstance(row, dict) else None
+        self.dead_letter_sink.write(self.name, response.url, reason, row, case_ref=case_ref)
+        self._inc_stat("rows/quarantined")
+        self._inc_stat(f"rows/quarantined/{reason}")
+        self.logger.warning("Quarantined row from %s: %s", response.url, reason)
+
+        budget = self._row_budgets.get(response.url)
+        if budget is not None:
+            budget.invalid += 1
+            self._check_row_budget(response.url, budget)
+
+    def _check_row_budget(self, url: str, budget: RowErrorBudget) -> None:
+        max_error_rate = self.get_option("DEAD_LETTER_MAX_ERROR_RATE", "dead_letter_max_error_rate")
+        min_rows = self.get_option("DEAD_LETTER_MIN_ROWS", "dead_letter_min_rows")
+        if budget.exceeded(max_error_rate, min_rows):
+            self._inc_stat("rows/aborted_artifacts")
+            raise DeadLetterThresholdExceeded(
+                f"{url}: {budget.invalid} of {budget.total} rows invalid (limit {max_error_rate:.0%})"
+            )
+
+    @property
+    def host_health(self) -> Optional[HostHealthTracker]:
+        threshold = self.get_option("HOST_FAILURE_THRESHOLD", "host_failure_threshold")
+        if threshold <= 0:
+            return None
+        if self._host_health is None:
+            self._host_health = HostHealthTracker(
+                self.state_dir / "host_health.json",
+                failure_threshold=threshold,
+                backoff=self.get_option("HOST_BACKOFF_SECONDS", "host_backoff_seconds"),
+                max_backoff=self.get_option("HOST_MAX_BACKOFF_SECONDS", "host_max_backoff_seconds"),
+            )
+        return self._host_health
+
+    @property
+    def parse_pool(self) -> ParsePool:
+        if self._parse_pool is None:
+            self._parse_pool = ParsePool(
+                kind=self.get_option("PARSE_POOL_KIND", "parse_pool_kind"),
+                size=self.get_option("PARSE_POOL_SIZE", "parse_pool_size"),
+                max_pending=self.get_option("PARSE_POOL_MAX_PENDING", "parse_pool_max_pending"),
+            )
+        return self._parse_pool
+
+    def closed(self, reason: str) -> None:
+        # Cursors are committed per completed URL; persist them once more so a
+        # budget or shutdown close never loses the latest state.
+        self._save_state()
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown()
+        if self._dead_letter_sink is not None:
+            self._dead_letter_sink.close()
+        if self._identity_index is not None:
+            self._identity_index.close()
+        if self._yield_history is not None:
+            self._yield_history.commit()
+        if self._host_health is not None:
+            self._host_health.save()
+            open_hosts = sum(1 for health in self._host_health.hosts.values() if health.state == OPEN)
+            self._inc_stat("host_health/open_hosts", open_hosts)
+
+        crawler = getattr(self, "crawler", None)
+        if crawler is not None and crawler.stats is not None:
+            valid = crawler.stats.get_value("rows/valid", 0, spider=self)
+            quarantined = crawler.stats.get_value("rows/quarantined", 0, spider=self)
+            if valid or quarantined:
+                crawler.stats.set_value("rows/error_rate", round(quarantined / (valid + quarantined), 4), spider=self)
+
     # --- cursor utilities
     def _build_cursor(self, response: Response) -> Cursor:
         etag = self._decode_header(response, b"ETag")
         last_modified = self._decode_header(response, b"Last-Modified")
         if etag or last_modified:
-            return Cursor(etag=etag, last_modified=last_modified)
-
-        listing_fingerprint = self.fingerprint_listing(response)
-        if listing_fingerprint:
-            return Cursor(list_fingerprint=listing_fingerprint)
+            cursor = Cursor(etag=etag, last_modified=last_modified)
+        elif listing_fingerprint := self.fingerprint_listing(response):
+            cursor = Cursor(list_fingerprint=listing_fingerprint)
+        else:
+            cursor = Cursor(artifact_sha256=hashlib.sha256(response.body).hexdigest())
 
-        artifact_sha = hashlib.sha256(response.body).hexdigest()
-        return Cursor(artifact_sha256=artifact_sha)
+        if self.append_only:
+            self._attach_append_state(cursor, response.body)
+        return cursor
 
     @staticmethod
     def _decode_header(response: Response, header: bytes) -> Optional[str]:
@@ -137,13 +636,25 @@ class BaseSpider(scrapy.Spider):
 
     # --- item helpers
     def build_source_metadata(self, response: Response, artifact_key: str | None = None) -> SourceMetadata:
-        fetched_at = datetime.now(timezone.utc).isoformat()
-        sha_value = hashlib.sha256(response.body).hexdigest()
+        # Every row of an artifact shares one fetch time and body digest.
+        memo = self._artifact_sources.get(response)
+        if memo is None:
+            memo = self._artifact_sources[response] = (
+                datetime.now(timezone.utc).isoformat(),
+                hashlib.sha256(response.body).hexdigest(),
+            )
+        fetched_at, sha_value = memo
         return SourceMetadata(url=response.url, fetched_at=fetched_at, raw_sha256=sha_value, artifact_key=artifact_key)
 
-    def wrap_normalized_case(self, normalized_case: dict, response: Response, artifact_key: str | None = None) -> NormalizedCaseResult:
+    def wrap_normalized_case(
+        self, normalized_case: dict, response: Response, artifact_key: str | None = None
+    ) -> Optional[NormalizedCaseResult]:
         source = self.build_source_metadata(response, artifact_key)
-        return NormalizedCaseResult.model_validate({"normalized_case": normalized_case, "source": source})
+        try:
+            return NormalizedCaseResult.model_validate({"normalized_case": normalized_case, "source": source})
+        except ValueError as exc:
+            self.quarantine(response, normalized_case, str(exc))
+            return None
 
     def sleep_between_requests(self, seconds: float) -> None:
         time.sleep(seconds)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, TextIO
+
+
+class DeadLetterThresholdExceeded(RuntimeError):
+    pass
+
+
+@dataclass
+class RowErrorBudget:
+    valid: int = 0
+    invalid: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.valid + self.invalid
+
+    @property
+    def error_rate(self) -> float:
+        return self.invalid / self.total if self.total else 0.0
+
+    def exceeded(self, max_error_rate: float, min_rows: int) -> bool:
+        return self.total >= min_rows and self.error_rate > max_error_rate
+
+
+class DeadLetterSink:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._handle: Optional[TextIO] = None
+
+    def write(
+        self,
+        spider: str,
+        url: str,
+        reason: str,
+        row: Any,
+        case_ref: Optional[str] = None,
+    ) -> None:
+        record: Dict[str, Any] = {
+            "spider": spider,
+            "url": url,
+            "reason": reason,
+            "row": row,
+            "at": datetime.now(timezone.utc).isoformat(),
+        }
+        if case_ref is not None:
+            record["case_ref"] = case_ref
+        line = json.dumps(record, separators=(",", ":"), default=str)
+        with self._lock:
+            if self._handle is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._handle = self.path.open("a", encoding="utf-8")
+            self._handle.write(line + "\n")
+            # Flushed per record so pooled workers appending to the same file
+            # never interleave partial lines.
+            self._handle.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+
+def read_dead_letters(path: Path) -> Iterator[Dict[str, Any]]:
+    if not path.exists():
+        return
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
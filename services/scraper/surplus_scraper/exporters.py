@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from scrapy.exporters import BaseItemExporter
+from scrapy.utils.python import to_bytes
+from scrapy.utils.serialize import ScrapyJSONEncoder
+
+from surplus_scraper.items import NormalizedCaseResult
+
+DEFAULT_ROW_GROUP_SIZE = 50_000
+
+CASE_SCHEMA = pa.schema(
+    [
+        ("case_ref", pa.string()),
+        ("state", pa.string()),
+        ("county_code", pa.string()),
+        ("source_system", pa.string()),
+        ("status", pa.string()),
+        ("filed_at", pa.date32()),
+        ("sale_date", pa.date32()),
+        ("property_id", pa.string()),
+        ("property_line1", pa.string()),
+        ("property_line2", pa.string()),
+        ("property_city", pa.string()),
+        ("property_state", pa.string()),
+        ("property_county_code", pa.string()),
+        ("property_postal_code", pa.string()),
+        ("party_roles", pa.list_(pa.string())),
+        ("party_names", pa.list_(pa.string())),
+        ("party_contacts", pa.list_(pa.string())),
+        ("amount_types", pa.list_(pa.string())),
+        ("amount_values", pa.list_(pa.float64())),
+        ("amount_currencies", pa.list_(pa.string())),
+        ("amount_total", pa.float64()),
+        ("metadata_json", pa.string()),
+        ("raw_json", pa.string()),
+        ("source_url", pa.string()),
+        ("source_fetched_at", pa.timestamp("us", tz="UTC")),
+        ("source_raw_sha256", pa.string()),
+        ("source_artifact_key", pa.string()),
+    ]
+)
+
+# Low-cardinality columns that repeat across rows and within an artifact.
+DICTIONARY_COLUMNS = [
+    "state",
+    "county_code",
+    "source_system",
+    "status",
+    "property_city",
+    "property_state",
+    "property_county_code",
+    "party_roles.list.element",
+    "amount_types.list.element",
+    "amount_currencies.list.element",
+    "source_url",
+    "source_raw_sha256",
+    "source_artifact_key",
+]
+
+
+def _date(value: Optional[str]) -> Optional[dt.date]:
+    return dt.date.fromisoformat(value) if value else None
+
+
+def _timestamp(value: Optional[str]) -> Optional[dt.datetime]:
+    if not value:
+        return None
+    parsed = dt.datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=dt.timezone.utc)
+
+
+def _json(value: Any) -> Optional[str]:
+    return json.dumps(value, sort_keys=True, separators=(",", ":")) if value is not None else None
+
+
+def flatten_case(item: Dict[str, Any]) -> Dict[str, Any]:
+    case = item["normalized_case"]
+    source = item["source"]
+    address = case.get("property_address") or {}
+    parties = case.get("parties") or []
+    amounts = case.get("amounts") or []
+    metadata = case.get("metadata")
+    return {
+        "case_ref": case["case_ref"],
+        "state": case["state"],
+        "county_code": case["county_code"],
+        "source_system": case["source_system"],
+        "status": case.get("status"),
+        "filed_at": _date(case.get("filed_at")),
+        "sale_date": _date(case.get("sale_date")),
+        "property_id": metadata.get("property_id") if isinstance(metadata, dict) else None,
+        "property_line1": address.get("line1"),
+        "property_line2": address.get("line2"),
+        "property_city": address.get("city"),
+        "property_state": address.get("state"),
+        "property_county_code": address.get("county_code"),
+        "property_postal_code": address.get("postal_code"),
+        "party_roles": [party["role"] for party in parties],
+        "party_names": [party["name"] for party in parties],
+        "party_contacts": [_json(party.get("contact")) for party in parties],
+        "amount_types": [amount["type"] for amount in amounts],
+        "amount_values": [amount["amount"] for amount in amounts],
+        "amount_currencies": [amount.get("currency", "USD") for amount in amounts],
+        "amount_total": sum(amount["amount"] for amount in amounts),
+        "metadata_json": _json(metadata),
+        "raw_json": _json(case.get("raw")),
+        "source_url": source["url"],
+        "source_fetched_at": _timestamp(source.get("fetched_at")),
+        "source_raw_sha256": source.get("raw_sha256"),
+        "source_artifact_key": source.get("artifact_key"),
+    }
+
+
+class ParquetItemExporter(BaseItemExporter):
+    def __init__(self, file, **kwargs):
+        self.row_group_size = int(kwargs.pop("row_group_size", DEFAULT_ROW_GROUP_SIZE))
+        self.compression = kwargs.pop("compression", "zstd")
+        super().__init__(dont_fail=True, **kwargs)
+        self.file = file
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._columns: Dict[str, List[Any]] = {name: [] for name in CASE_SCHEMA.names}
+        self._pending = 0
+
+    def start_exporting(self) -> None:
+        self._writer = pq.ParquetWriter(
+            self.file,
+            CASE_SCHEMA,
+            compression=self.compression,
+            use_dictionary=DICTIONARY_COLUMNS,
+        )
+
+    def export_item(self, item) -> None:
+        if isinstance(item, NormalizedCaseResult):
+            item = item.model_dump()
+        for name, value in flatten_case(item).items():
+            self._columns[name].append(value)
+        self._pending += 1
+        if self._pending >= self.row_group_size:
+            self._write_row_group()
+
+    def finish_exporting(self) -> None:
+        if self._pending:
+            self._write_row_group()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _write_row_group(self) -> None:
+        table = pa.Table.from_pydict(self._columns, schema=CASE_SCHEMA)
+        self._writer.write_table(table, row_group_size=self.row_group_size)  # type: ignore[union-attr]
+        self._columns = {name: [] for name in CASE_SCHEMA.names}
+        self._pending = 0
+
+
+def _short_id(counter: int) -> str:
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+    encoded = ""
+    while True:
+        counter, remainder = divmod(counter, 36)
+        encoded = digits[remainder] + encoded
+        if not counter:
+            return encoded
+
+
+class CompactJsonLinesItemExporter(BaseItemExporter):
+    """JSON lines feed that writes each artifact's source block only once.
+
+    The first item of an artifact is preceded by a ``{"source_id", "source"}``
+    header line; items carry ``source_ref`` instead of the full ``source``.
+    ``expand_compact_feed`` restores the ``model_dump()`` shape.
+    """
+
+    def __init__(self, file, **kwargs):
+        super().__init__(dont_fail=True, **kwargs)
+        self.file = file
+        self._kwargs.setdefault("ensure_ascii", not self.encoding)
+        self.encoder = ScrapyJSONEncoder(**self._kwargs)
+        self._source_ids: Dict[tuple, str] = {}
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self.file.write(to_bytes(self.encoder.encode(record) + "\n", self.encoding))
+
+    def export_item(self, item) -> None:
+        if isinstance(item, NormalizedCaseResult):
+            item = item.model_dump()
+        source = item["source"]
+        key = tuple(sorted(source.items()))
+        source_id = self._source_ids.get(key)
+        if source_id is None:
+            source_id = self._source_ids[key] = _short_id(len(self._source_ids))
+            self._write({"source_id": source_id, "source": source})
+        self._write({"normalized_case": item["normalized_case"], "source_ref": source_id})
+
+
+def expand_compact_feed(lines: Iterable[Union[str, bytes]]) -> Iterator[Dict[str, Any]]:
+    """Yield ``model_dump()``-shaped items from compact (or plain) JSON lines."""
+    sources: Dict[str, Dict[str, Any]] = {}
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if "source_id" in record:
+            sources[record["source_id"]] = record["source"]
+        elif "source_ref" in record:
+            source = sources.get(record["source_ref"])
+            if source is None:
+                raise ValueError(f"source_ref {record['source_ref']!r} has no preceding header")
+            yield {"normalized_case": record["normalized_case"], "source": source}
+        else:
+            yield record
+
+
+def read_compact_feed(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    with open(path, "rb") as handle:
+        yield from expand_compact_feed(handle)
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import logging
+import os
+import resource
+import sys
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from scrapy import signals
+from twisted.internet import task
+
+logger = logging.getLogger(__name__)
+
+
+def current_rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as handle:
+            pages = int(handle.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1_048_576
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1_048_576 if sys.platform == "darwin" else peak / 1024
+
+
+@dataclass
+class Budget:
+    max_bytes: int = 0
+    max_items: int = 0
+    max_rss_mb: float = 0
+    max_seconds: float = 0
+
+    @classmethod
+    def for_spider(cls, spider, settings) -> "Budget":
+        def option(setting: str, attribute: str) -> float:
+            if hasattr(spider, "get_option"):
+                return spider.get_option(setting, attribute)
+            return settings.getfloat(setting, 0)
+
+        return cls(
+            max_bytes=int(option("BUDGET_MAX_BYTES", "budget_max_bytes")),
+            max_items=int(option("BUDGET_MAX_ITEMS", "budget_max_items")),
+            max_rss_mb=float(option("BUDGET_MAX_RSS_MB", "budget_max_rss_mb")),
+            max_seconds=float(option("BUDGET_MAX_SECONDS", "budget_max_seconds")),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return any((self.max_bytes, self.max_items, self.max_rss_mb, self.max_seconds))
+
+
+class BudgetWatchdog:
+    """Closes a spider once it exceeds its byte, item, RSS or wall-clock budget.
+
+    Limits of 0 are unlimited. Byte and item budgets are checked as responses
+    and items arrive; RSS and wall time every BUDGET_CHECK_INTERVAL seconds.
+    """
+
+    def __init__(self, crawler, check_interval: float = 5.0) -> None:
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.check_interval = check_interval
+        self.budget = Budget()
+        self.started = 0.0
+        self.bytes = 0
+        self.items = 0
+        self.rss_peak = 0.0
+        self.exceeded: Optional[str] = None
+        self._task: Optional[task.LoopingCall] = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        watchdog = cls(crawler, crawler.settings.getfloat("BUDGET_CHECK_INTERVAL", 5.0))
+        crawler.signals.connect(watchdog.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(watchdog.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(watchdog.response_received, signal=signals.response_received)
+        crawler.signals.connect(watchdog.item_scraped, signal=signals.item_scraped)
+        return watchdog
+
+    def spider_opened(self, spider) -> None:
+        self.budget = Budget.for_spider(spider, self.crawler.settings)
+        self.started = time.monotonic()
+        if self.budget.enabled:
+            self._task = task.LoopingCall(self.check, spider)
+            self._task.start(self.check_interval, now=False)
+
+    def spider_closed(self, spider, reason: str) -> None:
+        if self._task is not None and self._task.running:
+            self._task.stop()
+        self.stats.set_value("budget/bytes", self.bytes, spider=spider)
+        self.stats.set_value("budget/items", self.items, spider=spider)
+        self.stats.set_value("budget/elapsed_seconds", round(time.monotonic() - self.started, 3), spider=spider)
+        if self.rss_peak:
+            self.stats.set_value("budget/rss_peak_mb", round(self.rss_peak, 1), spider=spider)
+
+    def response_received(self, response, request, spider) -> None:
+        self.bytes += len(response.body)
+        if self.budget.max_bytes and self.bytes > self.budget.max_bytes:
+            self.stop(spider, "bytes", self.bytes, self.budget.max_bytes)
+
+    def item_scraped(self, item, response, spider) -> None:
+        self.items += 1
+        if self.budget.max_items and self.items >= self.budget.max_items:
+            self.stop(spider, "items", self.items, self.budget.max_items)
+
+    def check(self, spider) -> None:
+        elapsed = time.monotonic() - self.started
+        if self.budget.max_seconds and elapsed > self.budget.max_seconds:
+            self.stop(spider, "wall_time", round(elapsed, 1), self.budget.max_seconds)
+            return
+        if self.budget.max_rss_mb:
+            rss = current_rss_mb()
+            self.rss_peak = max(self.rss_peak, rss)
+            if rss > self.budget.max_rss_mb:
+                self.stop(spider, "rss", round(rss, 1), self.budget.max_rss_mb)
+
+    def stop(self, spider, kind: str, used: float, limit: float) -> None:
+        if self.exceeded is not None:
+            return
+        self.exceeded = kind
+        logger.warning("Budget %s exceeded for %s (%s > %s); closing spider", kind, spider.name, used, limit)
+        self.stats.set_value("budget/exceeded", kind, spider=spider)
+        self.crawler.engine.close_spider(spider, f"budget_{kind}")
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+LATENCY_SMOOTHING = 0.3
+
+
+@dataclass
+class HostHealth:
+    state: str = CLOSED
+    consecutive_failures: int = 0
+    open_count: int = 0
+    open_until: float = 0.0
+    latency: Optional[float] = None
+    last_error: Optional[str] = None
+    probing: bool = field(default=False, repr=False)
+
+
+def merge_host_health(current: dict, other: dict) -> dict:
+    """Pick the more pessimistic of two saved entries for the same host.
+
+    Used when shard state is merged: the entry that keeps the host open
+    longest wins, then the one with more consecutive failures.
+    """
+
+    def severity(data: dict) -> Tuple[float, int, int]:
+        return (data.get("open_until", 0.0), data.get("consecutive_failures", 0), data.get("open_count", 0))
+
+    return other if severity(other) > severity(current) else current
+
+
+class HostHealthTracker:
+    """Per-host circuit breaker persisted as JSON next to the cursor state.
+
+    After ``failure_threshold`` consecutive failures a host is opened and
+    skipped for ``backoff`` seconds, doubling for every re-open up to
+    ``max_backoff``. Once the backoff expires one probe request is let
+    through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        failure_threshold: int = 3,
+        backoff: float = 1800.0,
+        max_backoff: float = 86400.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.failure_threshold = failure_threshold
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self.transitions: List[Tuple[str, str, str]] = []
+        self._lock = threading.Lock()
+        self.hosts: Dict[str, HostHealth] = self._load()
+
+    def _load(self) -> Dict[str, HostHealth]:
+        if not self.path.exists():
+            return {}
+        try:
+            payload = json.loads(self.path.read_text())
+            return {host: HostHealth(**data) for host, data in payload.items()}
+        except (json.JSONDecodeError, TypeError):
+            return {}
+
+    def save(self) -> None:
+        with self._lock:
+            serializable = {host: asdict(health) for host, health in self.hosts.items()}
+        for data in serializable.values():
+            data.pop("probing", None)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(serializable, indent=2))
+        os.replace(tmp_path, self.path)
+
+    def _transition(self, host: str, health: HostHealth, state: str) -> None:
+        self.transitions.append((host, health.state, state))
+        health.state = state
+
+    def allow(self, host: str) -> bool:
+        with self._lock:
+            health = self.hosts.get(host)
+            if health is None or health.state == CLOSED:
+                return True
+            if health.state == OPEN:
+                if self.clock() < health.open_until:
+                    return False
+                self._transition(host, health, HALF_OPEN)
+            if health.probing:
+                return False
+            health.probing = True
+            return True
+
+    def probe_in_flight(self, host: str) -> bool:
+        with self._lock:
+            health = self.hosts.get(host)
+            return health is not None and health.probing
+
+    def release_probe(self, host: str) -> None:
+        # The probe was dropped before reaching the host; let another request probe.
+        with self._lock:
+            health = self.hosts.get(host)
+            if health is not None:
+                health.probing = False
+
+    def record_success(self, host: str, latency: Optional[float] = None) -> None:
+        with self._lock:
+            health = self.hosts.setdefault(host, HostHealth())
+            if latency is not None:
+                health.latency = (
+                    latency
+                    if health.latency is None
+                    else LATENCY_SMOOTHING * latency + (1 - LATENCY_SMOOTHING) * health.latency
+                )
+            health.consecutive_failures = 0
+            health.probing = False
+            if health.state != CLOSED:
+                self._transition(host, health, CLOSED)
+                health.open_count = 0
+                health.open_until = 0.0
+
+    def record_failure(self, host: str, reason: str) -> None:
+        with self._lock:
+            health = self.hosts.setdefault(host, HostHealth())
+            health.consecutive_failures += 1
+            health.last_error = reason
+            health.probing = False
+            if health.state == HALF_OPEN or (
+                health.state == CLOSED and health.consecutive_failures >= self.failure_threshold
+            ):
+                delay = min(self.backoff * 2**health.open_count, self.max_backoff)
+                health.open_count += 1
+                health.open_until = self.clock() + delay
+                self._transition(host, health, OPEN)
+
+    def drain_transitions(self) -> List[Tuple[str, str, str]]:
+        with self._lock:
+            transitions, self.transitions = self.transitions, []
+        return transitions
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from lxml import etree
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+CELL_TAGS = ("td", "th")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_header(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).strip().lower()
+
+
+def _cell_text(cell: etree._Element) -> str:
+    return "".join(cell.itertext()).strip()
+
+
+def _release(element: etree._Element) -> None:
+    # Drop the finished row and any already-processed siblings so the partial
+    # tree never holds more than one row at a time.
+    element.clear()
+    parent = element.getparent()
+    if parent is None:
+        return
+    while element.getprevious() is not None:
+        del parent[0]
+
+
+class _TableRowStream:
+    def __init__(
+        self,
+        table_id: Optional[str],
+        headers: Optional[Sequence[str]],
+        columns: Optional[Mapping[str, str]],
+    ) -> None:
+        self.table_id = table_id
+        self.headers: Optional[List[str]] = [normalize_header(h) for h in headers] if headers else None
+        self.columns = {field: normalize_header(header) for field, header in (columns or {}).items()}
+        self.depth = 0
+        self.done = False
+
+    def consume(self, events: Iterable[Tuple[str, etree._Element]]) -> Iterator[Dict[str, str]]:
+        for event, element in events:
+            tag = element.tag
+            if not isinstance(tag, str) or self.done:
+                continue
+            tag = tag.lower()
+
+            if event == "start":
+                if tag == "table":
+                    if self.depth:
+                        self.depth += 1
+                    elif self.table_id is None or element.get("id") == self.table_id:
+                        self.depth = 1
+                continue
+
+            if not self.depth:
+                continue
+            if tag == "table":
+                self.depth -= 1
+                self.done = self.depth == 0
+                if self.done:
+                    self.finish()
+                continue
+            if tag != "tr" or self.depth != 1:
+                continue
+
+            row = self._read_row(element)
+            _release(element)
+            if row is not None:
+                yield row
+
+    def _read_row(self, element: etree._Element) -> Optional[Dict[str, str]]:
+        cells = [cell for cell in element if isinstance(cell.tag, str) and cell.tag.lower() in CELL_TAGS]
+        if not cells:
+            return None
+        texts = [_cell_text(cell) for cell in cells]
+
+        section = element.getparent().tag.lower() if element.getparent() is not None else None
+        all_th = all(cell.tag.lower() == "th" for cell in cells)
+        if self.headers is None:
+            if section == "thead" or all_th or self._names_columns(texts):
+                self._set_headers(texts)
+            return None
+        # Long listings repeat the header inside <tbody>; those rows, further
+        # <thead> rows and <tfoot> totals are not data.
+        if section in ("thead", "tfoot") or all_th or [normalize_header(text) for text in texts] == self.headers:
+            return None
+
+        row = dict(zip(self.headers, texts))
+        if not self.columns:
+            return row
+        if any(header not in row for header in self.columns.values()):
+            return None
+        return {field: row[header] for field, header in self.columns.items()}
+
+    def _names_columns(self, texts: List[str]) -> bool:
+        # Header rows made of <td> cells are recognised by naming every mapped column.
+        normalized = {normalize_header(text) for text in texts}
+        return bool(self.columns) and all(header in normalized for header in self.columns.values())
+
+    def finish(self) -> None:
+        if self.columns and self.headers is None:
+            raise ValueError("table has no header row naming the mapped columns")
+
+    def _set_headers(self, texts: List[str]) -> None:
+        headers = [normalize_header(text) for text in texts]
+        missing = [header for header in self.columns.values() if header not in headers]
+        if missing:
+            raise ValueError(f"table is missing columns: {', '.join(missing)}")
+        self.headers = headers
+
+
+def iter_table_rows(
+    body: bytes,
+    table_id: Optional[str] = None,
+    columns: Optional[Mapping[str, str]] = None,
+    headers: Optional[Sequence[str]] = None,
+    encoding: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Dict[str, str]]:
+    """Stream the body rows of an HTML table as dictionaries keyed by header.
+
+    The first header row (``<thead>`` or all ``<th>`` cells) names the columns
+    unless ``headers`` is given; later header rows, ``<thead>`` and ``<tfoot>``
+    rows are skipped. With ``columns`` (field -> header text), rows
+    are keyed by field, rows missing any mapped column are skipped, and a
+    table without a matching header row raises ``ValueError``.
+    """
+    if not body or body.isspace():
+        return
+    parser = etree.HTMLPullParser(events=("start", "end"), tag=("table", "tr"), encoding=encoding)
+    stream = _TableRowStream(table_id, headers, columns)
+    for offset in range(0, len(body), chunk_size):
+        parser.feed(body[offset : offset + chunk_size])
+        yield from stream.consume(parser.read_events())
+        if stream.done:
+            return
+    parser.close()
+    yield from stream.consume(parser.read_events())
+    if stream.depth:
+        stream.finish()
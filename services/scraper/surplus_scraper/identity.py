@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+import sqlite3
+import struct
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+ADDRESS_ABBREVIATIONS = {
+    "STREET": "ST",
+    "AVENUE": "AVE",
+    "ROAD": "RD",
+    "DRIVE": "DR",
+    "LANE": "LN",
+    "BOULEVARD": "BLVD",
+    "COURT": "CT",
+    "PLACE": "PL",
+    "TERRACE": "TER",
+    "PARKWAY": "PKWY",
+    "HIGHWAY": "HWY",
+    "CIRCLE": "CIR",
+    "NORTH": "N",
+    "SOUTH": "S",
+    "EAST": "E",
+    "WEST": "W",
+}
+
+_NON_ALNUM = re.compile(r"[^A-Z0-9]+")
+_BLOOM_MAGIC = b"BLM2"
+_BLOOM_HEADER = struct.Struct("<4sQQQ")
+
+Owner = Tuple[str, str]
+
+
+def normalize_locality(address: Dict[str, Any]) -> str:
+    city = _NON_ALNUM.sub(" ", (address.get("city") or "").upper()).strip()
+    return (address.get("postal_code") or "")[:5] or city
+
+
+def normalize_address(address: Dict[str, Any]) -> Optional[str]:
+    line1 = address.get("line1")
+    if not line1:
+        return None
+    tokens = [ADDRESS_ABBREVIATIONS.get(token, token) for token in _NON_ALNUM.sub(" ", line1.upper()).split()]
+    locality = normalize_locality(address)
+    if not tokens or not locality:
+        return None
+    return f"{' '.join(tokens)}|{locality}"
+
+
+def normalize_property_id(value: Any, locality: str) -> Optional[str]:
+    # Parcel numbers are assigned per county, so they only identify a
+    # property together with where it is.
+    if not isinstance(value, str) or not locality:
+        return None
+    parcel = _NON_ALNUM.sub("", value.upper())
+    return f"{parcel}|{locality}" if parcel else None
+
+
+def identity_keys(normalized_case: Dict[str, Any]) -> List[bytes]:
+    state = normalized_case.get("state", "").upper()
+    sale_date = normalized_case.get("sale_date") or normalized_case.get("filed_at") or ""
+    address = normalized_case.get("property_address") or {}
+    metadata = normalized_case.get("metadata")
+    property_id = metadata.get("property_id") if isinstance(metadata, dict) else None
+    county = _NON_ALNUM.sub("", (normalized_case.get("county_code") or address.get("county_code") or "").upper())
+    candidates = [
+        ("address", (address.get("state") or state).upper(), normalize_address(address)),
+        ("parcel", state, normalize_property_id(property_id, normalize_locality(address) or county)),
+    ]
+    return [
+        hashlib.sha256(f"{kind}|{key_state}|{value}|{sale_date}".encode()).digest()[:16]
+        for kind, key_state, value in candidates
+        if value
+    ]
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        self.size = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: bytes):
+        h1 = int.from_bytes(key[:8], "little")
+        h2 = int.from_bytes(key[8:16], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: bytes) -> None:
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: bytes) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def save(self, path: Path, watermark: int) -> None:
+        # Every spider shares the index, so concurrent closes need their own temp file.
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        header = _BLOOM_HEADER.pack(_BLOOM_MAGIC, self.size, self.hashes, watermark)
+        tmp_path.write_bytes(header + bytes(self.bits))
+        tmp_path.replace(path)
+
+    def load(self, path: Path) -> Optional[int]:
+        """Load a saved filter of the same geometry and return its watermark."""
+        if not path.exists():
+            return None
+        data = path.read_bytes()
+        if len(data) != _BLOOM_HEADER.size + len(self.bits):
+            return None
+        magic, size, hashes, watermark = _BLOOM_HEADER.unpack_from(data)
+        if (magic, size, hashes) != (_BLOOM_MAGIC, self.size, self.hashes):
+            return None
+        self.bits = bytearray(data[_BLOOM_HEADER.size :])
+        return watermark
+
+
+def bloom_capacity_for(rows: int, minimum: int) -> int:
+    # Doubling keeps the geometry, and so the saved filter, stable until the
+    # index outgrows it.
+    capacity = max(minimum, 1)
+    while capacity < 2 * rows:
+        capacity *= 2
+    return capacity
+
+
+class IdentityIndex:
+    """Persistent map of property identity keys to the first case that claimed them.
+
+    Keys are 16-byte digests stored in SQLite, each with an insertion sequence
+    number. An optional Bloom filter answers "definitely new" without touching
+    the database. It is sized from the row count, persisted next to the index
+    with the sequence it covers, and caught up on a background thread by
+    adding only rows inserted since; lookups go to SQLite until it is ready.
+    Rows written concurrently by another process may not be seen as
+    duplicates until the next run.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        bloom_capacity: int = 10_000_000,
+        bloom_error_rate: float = 0.01,
+        batch_size: int = 1000,
+    ) -> None:
+        self.path = path
+        self.bloom_path = path.with_suffix(".bloom")
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._pending: Dict[bytes, Owner] = {}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS identities (key BLOB PRIMARY KEY, case_ref TEXT NOT NULL, "
+            "source_system TEXT NOT NULL, seq INTEGER NOT NULL DEFAULT 0) WITHOUT ROWID"
+        )
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(identities)")]
+        if "seq" not in columns:
+            self._conn.execute("ALTER TABLE identities ADD COLUMN seq INTEGER NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS identities_seq ON identities (seq)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS identity_meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self._conn.execute("INSERT OR IGNORE INTO identity_meta (name, value) VALUES ('rows', 0)")
+        self._conn.execute("INSERT OR IGNORE INTO identity_meta (name, value) VALUES ('next_seq', 1)")
+        self._conn.commit()
+
+        self.bloom: Optional[BloomFilter] = None
+        self.bloom_ready = threading.Event()
+        self.bloom_keys_loaded = 0
+        self._bloom_watermark = 0
+        self._unfiltered: List[bytes] = []
+        self._closing = False
+        self._loader: Optional[threading.Thread] = None
+        if bloom_capacity > 0:
+            self._loader = threading.Thread(
+                target=self._load_bloom, args=(bloom_capacity, bloom_error_rate), name="identity-bloom", daemon=True
+            )
+            self._loader.start()
+        else:
+            self.bloom_ready.set()
+
+    def _meta(self, conn: sqlite3.Connection, name: str) -> int:
+        return conn.execute("SELECT value FROM identity_meta WHERE name = ?", (name,)).fetchone()[0]
+
+    def _load_bloom(self, minimum_capacity: int, error_rate: float) -> None:
+        conn = sqlite3.connect(self.path, timeout=30.0)
+        try:
+            watermark = self._meta(conn, "next_seq")
+            bloom = BloomFilter(bloom_capacity_for(self._meta(conn, "rows"), minimum_capacity), error_rate)
+            saved = bloom.load(self.bloom_path)
+            loaded = 0
+            for (key,) in conn.execute("SELECT key FROM identities WHERE seq >= ?", (saved or 0,)):
+                if self._closing:
+                    return
+                bloom.add(key)
+                loaded += 1
+        finally:
+            conn.close()
+        with self._lock:
+            for key in self._unfiltered:
+                bloom.add(key)
+            self._unfiltered = []
+            self.bloom = bloom
+            self.bloom_keys_loaded = loaded
+            self._bloom_watermark = watermark
+        self.bloom_ready.set()
+
+    def _lookup(self, key: bytes) -> Optional[Owner]:
+        owner = self._pending.get(key)
+        if owner is not None:
+            return owner
+        if self.bloom is not None and key not in self.bloom:
+            return None
+        row = self._conn.execute("SELECT case_ref, source_system FROM identities WHERE key = ?", (key,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def observe(self, keys: List[bytes], case_ref: str, source_system: str) -> Optional[Owner]:
+        """Register the keys and return the owner if another source already claimed one of them."""
+        duplicate_of: Optional[Owner] = None
+        with self._lock:
+            for key in keys:
+                owner = self._lookup(key)
+                if owner is None:
+                    self._pending[key] = (case_ref, source_system)
+                    if self.bloom is not None:
+                        self.bloom.add(key)
+                    elif self._loader is not None:
+                        self._unfiltered.append(key)
+                elif owner[1] != source_system and duplicate_of is None:
+                    duplicate_of = owner
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+        return duplicate_of
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        with self._conn:
+            # IMMEDIATE serialises the sequence read-modify-write across processes.
+            self._conn.execute("BEGIN IMMEDIATE")
+            next_seq = self._meta(self._conn, "next_seq")
+            rows = [
+                (key, case_ref, source, next_seq + offset)
+                for offset, (key, (case_ref, source)) in enumerate(self._pending.items())
+            ]
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO identities (key, case_ref, source_system, seq) VALUES (?, ?, ?, ?)", rows
+            )
+            inserted = self._conn.total_changes - before
+            self._conn.execute("UPDATE identity_meta SET value = value + ? WHERE name = 'rows'", (inserted,))
+            self._conn.execute("UPDATE identity_meta SET value = ? WHERE name = 'next_seq'", (next_seq + len(rows),))
+        self._pending.clear()
+
+    def close(self) -> None:
+        if self._loader is not None:
+            self._closing = not self.bloom_ready.is_set()
+            self._loader.join()
+        with self._lock:
+            self._flush_locked()
+            # The filter covers every row below its watermark plus this run's
+            # own keys; rows other processes added since are caught up next time.
+            if self.bloom is not None:
+                self.bloom.save(self.bloom_path, self._bloom_watermark)
+            self._conn.close()
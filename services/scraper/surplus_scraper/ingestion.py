@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import http.client
+import json
+import os
+import queue
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+RETRYABLE_STATUSES = {408, 429}
+# Statuses that blame the batch itself; anything else in 4xx (bad token,
+# wrong path) is a configuration problem and the batch is kept for replay.
+REJECTED_STATUSES = {400, 409, 413, 422}
+
+
+class IngestionError(RuntimeError):
+    pass
+
+
+class IngestionRejected(IngestionError):
+    """The endpoint refused a batch with a status that retrying will not fix."""
+
+
+class ConnectionPool:
+    def __init__(self, endpoint: str, size: int = 2, timeout: float = 30.0) -> None:
+        parsed = urlparse(endpoint)
+        if parsed.scheme not in {"http", "https"} or not parsed.hostname:
+            raise ValueError(f"ingestion endpoint is invalid: {endpoint}")
+        self.scheme = parsed.scheme
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.path = (parsed.path or "/") + (f"?{parsed.query}" if parsed.query else "")
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(maxsize=size)
+
+    def acquire(self) -> http.client.HTTPConnection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            connection_cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            return connection_cls(self.host, self.port, timeout=self.timeout)
+
+    def release(self, connection: http.client.HTTPConnection, reusable: bool) -> None:
+        if reusable:
+            try:
+                self._idle.put_nowait(connection)
+                return
+            except queue.Full:
+                pass
+        connection.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class IngestionClient:
+    def __init__(
+        self,
+        endpoint: str,
+        token: Optional[str] = None,
+        pool_size: int = 2,
+        timeout: float = 30.0,
+        retries: int = 3,
+        backoff: float = 0.5,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.endpoint = endpoint
+        self.pool = ConnectionPool(endpoint, size=pool_size, timeout=timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self._sleep = sleep
+        self.headers = {"Content-Type": "application/json"}
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+
+    def post_batch(self, spider: str, items: List[Dict[str, Any]]) -> int:
+        body = json.dumps({"spider": spider, "items": items}, separators=(",", ":")).encode()
+        error = "no attempt made"
+        for attempt in range(self.retries + 1):
+            try:
+                status = self._post(body)
+            except (OSError, http.client.HTTPException) as exc:
+                error = f"{type(exc).__name__}: {exc}"
+            else:
+                if 200 <= status < 300:
+                    return attempt
+                error = f"HTTP {status}"
+                if status in REJECTED_STATUSES:
+                    raise IngestionRejected(f"endpoint rejected {len(items)} items: {error}")
+                if status < 500 and status not in RETRYABLE_STATUSES:
+                    break
+            if attempt < self.retries:
+                self._sleep(self.backoff * 2**attempt)
+        raise IngestionError(f"failed to push {len(items)} items: {error}")
+
+    def _post(self, body: bytes) -> int:
+        connection = self.pool.acquire()
+        reusable = False
+        try:
+            connection.request("POST", self.pool.path, body=body, headers=self.headers)
+            response = connection.getresponse()
+            response.read()
+            reusable = not response.will_close
+            return response.status
+        finally:
+            self.pool.release(connection, reusable)
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+class SpillStore:
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def write(self, spider: str, items: List[Dict[str, Any]]) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"batch-{time.time_ns()}-{uuid.uuid4().hex[:8]}.json"
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"spider": spider, "items": items}, separators=(",", ":")))
+        os.replace(tmp_path, path)
+        return path
+
+    def pending(self) -> List[Path]:
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob("batch-*.json"))
+
+    @staticmethod
+    def load(path: Path) -> Tuple[str, List[Dict[str, Any]]]:
+        payload = json.loads(path.read_text())
+        return payload["spider"], payload["items"]
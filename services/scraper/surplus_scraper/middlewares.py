@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import logging
+from typing import Dict, List
+from urllib.parse import urlparse
+
+from scrapy.exceptions import IgnoreRequest
+from twisted.internet import defer
+
+logger = logging.getLogger(__name__)
+
+FAILURE_STATUSES = {408}
+
+
+class HostHealthMiddleware:
+    """Skips requests to hosts whose circuit is open and feeds outcomes back.
+
+    While a half-open host's probe is in flight, other requests to it are held
+    (still counting towards CONCURRENT_REQUESTS) and re-checked once the probe
+    finishes, so a recovered host gets them all. Spiders opt in by exposing a
+    ``host_health`` tracker (BaseSpider does).
+    """
+
+    def __init__(self, stats) -> None:
+        self.stats = stats
+        self._held: Dict[str, List[defer.Deferred]] = {}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler.stats)
+
+    @staticmethod
+    def _tracker(spider):
+        return getattr(spider, "host_health", None)
+
+    def process_request(self, request, spider):
+        tracker = self._tracker(spider)
+        if tracker is None:
+            return None
+        host = urlparse(request.url).netloc
+        allowed = tracker.allow(host)
+        self._record_transitions(tracker, spider)
+        if allowed:
+            if tracker.probe_in_flight(host):
+                request.meta["host_health_probe"] = True
+            return None
+        if tracker.probe_in_flight(host):
+            self.stats.inc_value("host_health/held_requests", spider=spider)
+            held = defer.Deferred()
+            held.addCallback(lambda _: self.process_request(request, spider))
+            self._held.setdefault(host, []).append(held)
+            return held
+        self.stats.inc_value("host_health/skipped_requests", spider=spider)
+        raise IgnoreRequest(f"circuit open for {host}")
+
+    def process_response(self, request, response, spider):
+        tracker = self._tracker(spider)
+        if tracker is None:
+            return response
+        host = urlparse(request.url).netloc
+        if response.status >= 500 or response.status in FAILURE_STATUSES:
+            tracker.record_failure(host, f"HTTP {response.status}")
+        else:
+            tracker.record_success(host, request.meta.get("download_latency"))
+        self._record_transitions(tracker, spider)
+        self._release(host)
+        return response
+
+    def process_exception(self, request, exception, spider):
+        tracker = self._tracker(spider)
+        if tracker is None:
+            return None
+        host = urlparse(request.url).netloc
+        if isinstance(exception, IgnoreRequest):
+            if not request.meta.get("host_health_probe"):
+                return None
+            tracker.release_probe(host)
+        else:
+            tracker.record_failure(host, type(exception).__name__)
+            self._record_transitions(tracker, spider)
+        self._release(host)
+        return None
+
+    def _release(self, host: str) -> None:
+        for held in self._held.pop(host, []):
+            held.callback(None)
+
+    def _record_transitions(self, tracker, spider) -> None:
+        transitions = tracker.drain_transitions()
+        for host, previous, current in transitions:
+            logger.info("Circuit for %s: %s -> %s", host, previous, current)
+            self.stats.inc_value(f"host_health/{previous}_to_{current}", spider=spider)
+        if transitions:
+            tracker.save()
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List
+
+
+@dataclass
+class PaginatedWatch:
+    url: str
+    max_pages: int
+    first_page: int = 1
+
+    def page_url(self, page: int) -> str:
+        return self.url.format(page=page)
+
+    @property
+    def last_page(self) -> int:
+        return self.first_page + self.max_pages - 1
+
+
+class PaginationRun:
+    """Decides which pages of a paginated watch to request next.
+
+    The leading pages are fetched first; if none of them changed the listing
+    is assumed unchanged and the run stops. Otherwise the remaining pages are
+    fanned out with at most ``concurrency`` requests in flight, stopping at
+    ``max_pages`` or the first page reported as past the end of the listing.
+    """
+
+    def __init__(self, watch: PaginatedWatch, leading_pages: int = 2, concurrency: int = 4) -> None:
+        if leading_pages < 1 or concurrency < 1:
+            raise ValueError("leading_pages and concurrency must be positive")
+        self.watch = watch
+        self.concurrency = concurrency
+        self.leading = list(range(watch.first_page, min(watch.first_page + leading_pages, watch.last_page + 1)))
+        self.pending_leading = set(self.leading)
+        self.next_page = watch.first_page + len(self.leading)
+        self.last_page = watch.last_page
+        self.in_flight = 0
+        self.fan_out = False
+        self.stopped = False
+
+    def start(self) -> List[int]:
+        self.in_flight += len(self.leading)
+        return list(self.leading)
+
+    def complete(self, page: int, changed: bool, exhausted: bool = False) -> List[int]:
+        self.in_flight -= 1
+        if exhausted:
+            self.last_page = min(self.last_page, page - 1)
+        if page in self.pending_leading:
+            self.pending_leading.discard(page)
+            self.fan_out = self.fan_out or changed
+            if not self.pending_leading and not self.fan_out:
+                self.stopped = True
+        if self.pending_leading or not self.fan_out:
+            return []
+
+        pages: List[int] = []
+        while self.in_flight < self.concurrency and self.next_page <= self.last_page:
+            pages.append(self.next_page)
+            self.next_page += 1
+            self.in_flight += 1
+        return pages
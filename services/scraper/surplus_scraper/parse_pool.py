@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
+
+from scrapy.http import Response
+from scrapy.settings import Settings
+
+from surplus_scraper.items import NormalizedCaseResult
+
+POOL_KINDS = {"thread", "process"}
+
+ResponsePayload = Tuple[Type[Response], str, int, Dict[bytes, List[bytes]], bytes, Optional[str]]
+# ("item", result or its model_dump) or ("quarantined", row, reason), in parse order.
+Outcome = Tuple[Any, ...]
+
+_worker_spiders: Dict[Tuple[type, str], Any] = {}
+
+
+class ParsePool:
+    """Executor for parse work, awaited from spider callbacks.
+
+    ``run`` awaits the running asyncio loop, so the pool needs the asyncio
+    reactor (``TWISTED_REACTOR`` in settings.py); under the default reactor
+    every pooled response fails with "no running event loop".
+    """
+
+    def __init__(self, kind: str = "thread", size: int = 4, max_pending: int = 2) -> None:
+        if kind not in POOL_KINDS:
+            raise ValueError(f"parse pool kind must be one of {sorted(POOL_KINDS)}")
+        if size < 1 or max_pending < 1:
+            raise ValueError("parse pool size and max_pending must be positive")
+        self.kind = kind
+        self.size = size
+        self.max_pending = max_pending
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.size)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="parse-pool")
+        return self._executor
+
+    @property
+    def slots(self) -> asyncio.Semaphore:
+        # Bounds how many artifacts are parsed at once; further responses wait
+        # on the reactor instead of queueing unbounded work in the pool.
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        return self._slots
+
+    async def run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, fn, *args)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+def take_outcomes(spider, records: Iterator[Optional[NormalizedCaseResult]], size: int) -> Tuple[List[Outcome], bool]:
+    """Pull up to ``size`` parse results on a pool thread.
+
+    Quarantined rows are buffered in parse order instead of written, so stats,
+    dead letters and identity bookkeeping stay on the reactor thread. Returns
+    the outcomes and whether ``records`` is exhausted.
+    """
+    outcomes: List[Outcome] = []
+    spider._quarantine_buffer = outcomes
+    pulled = 0
+    try:
+        for result in islice(records, size):
+            pulled += 1
+            if result is not None:
+                outcomes.append(("item", result))
+    finally:
+        spider._quarantine_buffer = None
+    return outcomes, pulled < size
+
+
+def serialize_response(response: Response) -> ResponsePayload:
+    headers = {bytes(key): list(values) for key, values in response.headers.items()}
+    encoding = getattr(response, "encoding", None)
+    return type(response), response.url, response.status, headers, response.body, encoding
+
+
+def deserialize_response(payload: ResponsePayload) -> Response:
+    response_cls, url, status, headers, body, encoding = payload
+    kwargs: Dict[str, Any] = {"url": url, "status": status, "headers": headers, "body": body}
+    if encoding is not None:
+        kwargs["encoding"] = encoding
+    return response_cls(**kwargs)
+
+
+def parse_artifact_in_process(
+    spider_cls: type,
+    spider_kwargs: Dict[str, Any],
+    settings: Dict[str, Any],
+    payload: ResponsePayload,
+    previous_cursor: Dict[str, Any],
+) -> Tuple[Dict[str, Any], Optional[List[Outcome]], Dict[str, int]]:
+    """Parse one artifact in a worker process without touching shared state.
+
+    Quarantined rows are returned rather than written, so dead letters, the
+    identity index and row budgets are handled by the crawling process.
+    """
+    key = (spider_cls, repr(sorted(spider_kwargs.items())))
+    spider = _worker_spiders.get(key)
+    if spider is None:
+        spider = _worker_spiders[key] = spider_cls(**spider_kwargs)
+    spider.settings = Settings(settings)
+
+    response = deserialize_response(payload)
+    next_cursor = spider._build_cursor(response)
+    if next_cursor.matches(type(next_cursor)(**previous_cursor)):
+        return asdict(next_cursor), None, spider._drain_stats()
+    outcomes: List[Outcome] = []
+    spider._quarantine_buffer = outcomes
+    try:
+        for result in spider.parse_records(response):
+            if result is not None:
+                outcomes.append(("item", result.model_dump()))
+    finally:
+        spider._quarantine_buffer = None
+    return asdict(next_cursor), outcomes, spider._drain_stats()
+
+
+def replay_outcomes(spider, response: Response, outcomes: List[Outcome]) -> Iterator[Optional[NormalizedCaseResult]]:
+    """Turn worker outcomes back into ``parse_records`` output on the crawling side."""
+    for outcome in outcomes:
+        if outcome[0] == "quarantined":
+            spider.quarantine(response, outcome[1], outcome[2])
+            yield None
+        elif isinstance(outcome[1], NormalizedCaseResult):
+            yield outcome[1]
+        else:
+            dump = outcome[1]
+            yield NormalizedCaseResult(normalized_case=dump["normalized_case"], source=dump["source"])
@@ -1,9 +1,182 @@
 from __future__ import annotations
 
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from scrapy.exceptions import NotConfigured
+from twisted.internet import defer, task, threads
+
+from surplus_scraper.deadletter import DeadLetterSink
+from surplus_scraper.ingestion import IngestionClient, IngestionError, IngestionRejected, SpillStore
 from surplus_scraper.items import NormalizedCaseResult
 
+logger = logging.getLogger(__name__)
+
 
 class NormalizedCaseValidationPipeline:
     def process_item(self, item, spider):  # type: ignore[override]
         result = NormalizedCaseResult.model_validate(item)
         return result.model_dump()
+
+
+class IngestionPushPipeline:
+    def __init__(
+        self,
+        client: IngestionClient,
+        stats,
+        batch_size: int = 500,
+        max_age: float = 5.0,
+        max_in_flight: int = 2,
+        spill_dir: Optional[str] = None,
+    ) -> None:
+        self.client = client
+        self.stats = stats
+        self.batch_size = batch_size
+        self.max_age = max_age
+        self.spill_dir = spill_dir
+        self.spill: Optional[SpillStore] = None
+        self.rejected: Optional[DeadLetterSink] = None
+        self.spider_name = ""
+        self._slots = defer.DeferredSemaphore(max_in_flight)
+        self._buffer: List[Dict[str, Any]] = []
+        self._buffer_started = 0.0
+        self._in_flight: set[defer.Deferred] = set()
+        self._flush_task = task.LoopingCall(self._flush_if_stale)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        endpoint = settings.get("INGEST_ENDPOINT")
+        if not endpoint:
+            raise NotConfigured("INGEST_ENDPOINT is not set")
+        max_in_flight = settings.getint("INGEST_MAX_IN_FLIGHT", 2)
+        client = IngestionClient(
+            endpoint,
+            token=settings.get("INGEST_TOKEN"),
+            pool_size=max_in_flight,
+            timeout=settings.getfloat("INGEST_TIMEOUT", 30.0),
+            retries=settings.getint("INGEST_RETRIES", 3),
+            backoff=settings.getfloat("INGEST_RETRY_BACKOFF", 0.5),
+        )
+        return cls(
+            client,
+            crawler.stats,
+            batch_size=settings.getint("INGEST_BATCH_SIZE", 500),
+            max_age=settings.getfloat("INGEST_BATCH_MAX_AGE", 5.0),
+            max_in_flight=max_in_flight,
+            spill_dir=settings.get("INGEST_SPILL_DIR"),
+        )
+
+    def open_spider(self, spider) -> None:
+        self.spider_name = spider.name
+        if self.spill_dir:
+            directory = Path(self.spill_dir % {"name": spider.name})
+        else:
+            directory = Path(getattr(spider, "state_dir", Path("ingest_spill") / spider.name)) / "ingest_spill"
+        self.spill = SpillStore(directory)
+        # Batches the endpoint refuses outright are kept for inspection, not replayed.
+        self.rejected = DeadLetterSink(directory / "rejected.jsonl")
+        self._flush_task.start(max(self.max_age / 2, 0.1), now=False)
+        for path in self.spill.pending():
+            _, items = SpillStore.load(path)
+            self._dispatch(items, spilled_path=path)
+
+    def process_item(self, item, spider):  # type: ignore[override]
+        payload = item.model_dump() if isinstance(item, NormalizedCaseResult) else dict(item)
+        if not self._buffer:
+            self._buffer_started = time.monotonic()
+        self._buffer.append(payload)
+        if len(self._buffer) < self.batch_size:
+            return item
+        # Hold the item until a send slot is free so a slow endpoint pushes
+        # back on the engine instead of growing an unbounded backlog.
+        return self._flush().addCallback(lambda _: item)
+
+    def close_spider(self, spider):
+        if self._flush_task.running:
+            self._flush_task.stop()
+        self._flush()
+        pending = defer.DeferredList(list(self._in_flight))
+        pending.addBoth(lambda _: self._close())
+        return pending
+
+    def _close(self) -> None:
+        self.client.close()
+        if self.rejected is not None:
+            self.rejected.close()
+
+    def _flush_if_stale(self) -> None:
+        if self._buffer and time.monotonic() - self._buffer_started >= self.max_age:
+            self._flush()
+
+    def _flush(self) -> defer.Deferred:
+        if not self._buffer:
+            return defer.succeed(None)
+        batch, self._buffer = self._buffer, []
+        return self._dispatch(batch)
+
+    def _dispatch(self, items: List[Dict[str, Any]], spilled_path: Optional[Path] = None) -> defer.Deferred:
+        done: defer.Deferred = defer.Deferred()
+        self._in_flight.add(done)
+        done.addBoth(self._forget, done)
+
+        def send(_):
+            sending = threads.deferToThread(self._deliver, items, spilled_path)
+            sending.addCallback(self._record_delivery, len(items))
+            sending.addErrback(self._log_failure)
+            sending.addBoth(self._release)
+            sending.chainDeferred(done)
+
+        return self._slots.acquire().addCallback(send)
+
+    def _release(self, result):
+        self._slots.release()
+        return result
+
+    def _forget(self, result, done: defer.Deferred):
+        self._in_flight.discard(done)
+        return result
+
+    def _log_failure(self, failure) -> None:
+        self.stats.inc_value("ingest/errors")
+        logger.error("Ingestion push failed: %s", failure.getErrorMessage())
+
+    def _deliver(self, items: List[Dict[str, Any]], spilled_path: Optional[Path]) -> Dict[str, Any]:
+        try:
+            retries = self.client.post_batch(self.spider_name, items)
+        except IngestionRejected as exc:
+            for item in items:
+                case_ref = (item.get("normalized_case") or {}).get("case_ref")
+                self.rejected.write(  # type: ignore[union-attr]
+                    self.spider_name, self.client.endpoint, str(exc), item, case_ref=case_ref
+                )
+            if spilled_path is not None:
+                spilled_path.unlink(missing_ok=True)
+            return {"sent": False, "rejected": True, "error": str(exc)}
+        except IngestionError as exc:
+            if spilled_path is None:
+                spilled_path = self.spill.write(self.spider_name, items)  # type: ignore[union-attr]
+            return {"sent": False, "error": str(exc), "spilled": str(spilled_path)}
+        if spilled_path is not None:
+            spilled_path.unlink(missing_ok=True)
+        return {"sent": True, "retries": retries, "replayed": spilled_path is not None}
+
+    def _record_delivery(self, outcome: Dict[str, Any], count: int) -> None:
+        if outcome.get("rejected"):
+            logger.error("Ingestion endpoint rejected %d items: %s", count, outcome["error"])
+            self.stats.inc_value("ingest/batches_rejected")
+            self.stats.inc_value("ingest/items_rejected", count)
+            return
+        if not outcome["sent"]:
+            logger.warning("Spilled %d items to %s: %s", count, outcome["spilled"], outcome["error"])
+            self.stats.inc_value("ingest/batches_spilled")
+            self.stats.inc_value("ingest/items_spilled", count)
+            return
+        self.stats.inc_value("ingest/batches_sent")
+        self.stats.inc_value("ingest/items_sent", count)
+        if outcome["retries"]:
+            self.stats.inc_value("ingest/retries", outcome["retries"])
+        if outcome["replayed"]:
+            self.stats.inc_value("ingest/batches_replayed")
@@ -11,6 +11,8 @@ TWISTED_REACTOR = "twisted.internet.asyncioreactor.AsyncioSelectorReactor"
 
 DOWNLOADER_MIDDLEWARES = {
     "scrapy_playwright.handler.ScrapyPlaywrightDownloadHandler": 543,
+    # After RetryMiddleware (550) so every attempt counts towards the breaker.
+    "surplus_scraper.middlewares.HostHealthMiddleware": 560,
 }
 
 DOWNLOAD_HANDLERS = {
@@ -23,13 +25,46 @@ PLAYWRIGHT_LAUNCH_OPTIONS = {"headless": True}
 
 LOG_LEVEL = "INFO"
 
+DOWNLOAD_MAXSIZE = 256 * 1024 * 1024
+DOWNLOAD_WARNSIZE = 64 * 1024 * 1024
+
+# Per-job limits: BUDGET_MAX_BYTES, BUDGET_MAX_ITEMS, BUDGET_MAX_RSS_MB and
+# BUDGET_MAX_SECONDS, or the budget_* attributes on BaseSpider.
+EXTENSIONS = {
+    "surplus_scraper.extensions.BudgetWatchdog": 500,
+}
+
 ITEM_PIPELINES = {
     "surplus_scraper.pipelines.NormalizedCaseValidationPipeline": 300,
+    "surplus_scraper.pipelines.IngestionPushPipeline": 400,
 }
 
+# Direct batched push to the API; the pipeline is disabled when unset.
+INGEST_ENDPOINT = os.environ.get("SCRAPER_INGEST_ENDPOINT")
+INGEST_TOKEN = os.environ.get("SCRAPER_INGEST_TOKEN")
+INGEST_BATCH_SIZE = 500
+INGEST_BATCH_MAX_AGE = 5.0
+INGEST_MAX_IN_FLIGHT = 2
+INGEST_RETRIES = 3
+
+# SCRAPY_FEED_FORMAT=jsonlines_compact writes each artifact's source block
+# once and has items reference it; exporters.read_compact_feed and the
+# connectors package's ScrapydClient.fetchItems expand it back.
 FEEDS = {
     os.environ.get("SCRAPY_FEED_URI", "./output/%(name)s/%(time)s.json"): {
-        "format": "json",
+        "format": os.environ.get("SCRAPY_FEED_FORMAT", "json"),
         "overwrite": False,
     }
 }
+
+FEED_EXPORTERS = {
+    "parquet": "surplus_scraper.exporters.ParquetItemExporter",
+    "jsonlines_compact": "surplus_scraper.exporters.CompactJsonLinesItemExporter",
+}
+
+if os.environ.get("SCRAPY_PARQUET_FEED_URI"):
+    FEEDS[os.environ["SCRAPY_PARQUET_FEED_URI"]] = {
+        "format": "parquet",
+        "overwrite": False,
+        "item_export_kwargs": {"row_group_size": 50_000},
+    }
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import argparse
+import bisect
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from surplus_scraper.host_health import merge_host_health
+
+DEFAULT_VNODES = 64
+CURSOR_FILE = "cursor.json"
+YIELD_HISTORY_FILE = "yield_history.json"
+HOST_HEALTH_FILE = "host_health.json"
+SPILL_DIR = "ingest_spill"
+# Append-only logs, relative to a shard's state directory.
+DEAD_LETTER_FILES = ("dead_letter.jsonl", f"{SPILL_DIR}/rejected.jsonl")
+
+
+def _point(value: str) -> int:
+    return int.from_bytes(hashlib.sha1(value.encode()).digest()[:8], "big")
+
+
+class HashRing:
+    def __init__(self, shard_count: int, vnodes: int = DEFAULT_VNODES) -> None:
+        if shard_count < 1:
+            raise ValueError("shard_count must be positive")
+        self.shard_count = shard_count
+        ring = sorted(
+            (_point(f"shard-{shard}#{vnode}"), shard) for shard in range(shard_count) for vnode in range(vnodes)
+        )
+        self._points = [point for point, _ in ring]
+        self._shards = [shard for _, shard in ring]
+
+    def shard_for(self, key: str) -> int:
+        if self.shard_count == 1:
+            return 0
+        position = bisect.bisect(self._points, _point(key)) % len(self._points)
+        return self._shards[position]
+
+    def select(self, keys: Iterable[str], shard_index: int) -> List[str]:
+        if not 0 <= shard_index < self.shard_count:
+            raise ValueError(f"shard_index must be in [0, {self.shard_count})")
+        return [key for key in keys if self.shard_for(key) == shard_index]
+
+
+def shard_state_dir(spider_dir: Path, shard_index: int, shard_count: int) -> Path:
+    return spider_dir if shard_count == 1 else spider_dir / f"shard-{shard_index}"
+
+
+def _state_files(spider_dir: Path, filename: str) -> List[Path]:
+    files = [spider_dir / filename] + sorted(spider_dir.glob(f"shard-*/{filename}"))
+    return [path for path in files if path.exists()]
+
+
+def _redistribute(
+    spider_dir: Path,
+    filename: str,
+    shard_count: int,
+    shards_for: Callable[[str], Iterable[int]],
+    merge: Optional[Callable[[Any, Any], Any]] = None,
+) -> Dict[int, Dict[str, Any]]:
+    # Merge a URL- or host-keyed state file across every layout, rewrite it
+    # per shard and empty the copies that no longer belong to a shard. Without
+    # ``merge`` the last file holding a key wins.
+    merged: Dict[str, Any] = {}
+    sources = _state_files(spider_dir, filename)
+    for path in sources:
+        for key, value in json.loads(path.read_text() or "{}").items():
+            merged[key] = merge(merged[key], value) if merge is not None and key in merged else value
+
+    slices: Dict[int, Dict[str, Any]] = {shard: {} for shard in range(shard_count)}
+    for key, value in merged.items():
+        for shard in shards_for(key):
+            slices[shard][key] = value
+    if not sources:
+        return slices
+
+    targets = set()
+    for shard, entries in slices.items():
+        target = shard_state_dir(spider_dir, shard, shard_count) / filename
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(entries, indent=2))
+        os.replace(tmp_path, target)
+        targets.add(target)
+
+    for path in sources:
+        if path not in targets:
+            path.write_text(json.dumps({}, indent=2))
+    return slices
+
+
+def _adopt_orphans(spider_dir: Path, shard_count: int) -> None:
+    # Spilled ingest batches are replayed only by the shard that wrote them,
+    # so batches and dead letters from layouts that no longer exist move to
+    # the first shard of the new layout.
+    targets = {shard_state_dir(spider_dir, shard, shard_count) for shard in range(shard_count)}
+    survivor = shard_state_dir(spider_dir, 0, shard_count)
+    for layout in [spider_dir] + sorted(spider_dir.glob("shard-*")):
+        if layout in targets:
+            continue
+        for batch in sorted((layout / SPILL_DIR).glob("batch-*.json")):
+            (survivor / SPILL_DIR).mkdir(parents=True, exist_ok=True)
+            os.replace(batch, survivor / SPILL_DIR / batch.name)
+        for name in DEAD_LETTER_FILES:
+            source = layout / name
+            if not source.exists():
+                continue
+            target = survivor / name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with target.open("a", encoding="utf-8") as handle:
+                handle.write(source.read_text(encoding="utf-8"))
+            source.unlink()
+
+
+def watch_key_resolver(page_templates: Iterable[str]) -> Callable[[str], str]:
+    """Map page URLs of paginated watches back to the template URL they are sharded by."""
+    patterns = [
+        (re.compile(re.escape(template).replace(re.escape("{page}"), r"-?\d+") + "$"), template)
+        for template in page_templates
+    ]
+
+    def resolve(url: str) -> str:
+        for pattern, template in patterns:
+            if pattern.match(url):
+                return template
+        return url
+
+    return resolve
+
+
+def rebalance(
+    spider_dir: Path, shard_count: int, vnodes: int = DEFAULT_VNODES, page_templates: Iterable[str] = ()
+) -> Dict[int, int]:
+    """Redistribute every cursor under ``spider_dir`` for ``shard_count`` shards.
+
+    Cursor files from the unsharded layout and any previous shard layout are
+    merged, rewritten per shard, and emptied where they no longer belong.
+    Page cursors of paginated watches follow their ``page_templates`` entry,
+    as in ``BaseSpider.start_requests``. Yield history moves with its watch;
+    host health is merged and copied to every shard, since a host can serve
+    watches on several shards. Pending ``ingest_spill`` batches and the
+    ``dead_letter.jsonl`` / ``ingest_spill/rejected.jsonl`` logs of layouts
+    that no longer exist move to shard 0 (the spider directory when
+    ``shard_count`` is 1); paths set through ``DEAD_LETTER_PATH`` or
+    ``INGEST_SPILL_DIR`` are left alone. Returns the number of cursors per shard.
+    """
+    ring = HashRing(shard_count, vnodes)
+    watch_key = watch_key_resolver(page_templates)
+
+    def owner(url: str) -> List[int]:
+        return [ring.shard_for(watch_key(url))]
+
+    slices = _redistribute(spider_dir, CURSOR_FILE, shard_count, owner)
+    _redistribute(spider_dir, YIELD_HISTORY_FILE, shard_count, owner)
+    _redistribute(spider_dir, HOST_HEALTH_FILE, shard_count, lambda host: range(shard_count), merge_host_health)
+    _adopt_orphans(spider_dir, shard_count)
+    return {shard: len(cursors) for shard, cursors in slices.items()}
+
+
+def _page_templates(spider_name: str) -> List[str]:
+    from scrapy.spiderloader import SpiderLoader
+    from scrapy.utils.project import get_project_settings
+
+    try:
+        spider_cls = SpiderLoader.from_settings(get_project_settings()).load(spider_name)
+    except KeyError:
+        return []
+    return [watch.url for watch in getattr(spider_cls, "paginated_watches", [])]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Move spider cursor state to a new shard count")
+    parser.add_argument("spider", help="spider name, e.g. csv_feed_overages")
+    parser.add_argument("--shards", type=int, required=True, help="new shard count (1 merges back to one file)")
+    default_state_dir = os.environ.get("SCRAPER_STATE_DIR", str(Path(__file__).parent / ".state"))
+    parser.add_argument("--state-dir", default=default_state_dir)
+    args = parser.parse_args(argv)
+
+    counts = rebalance(Path(args.state_dir) / args.spider, args.shards, page_templates=_page_templates(args.spider))
+    for shard, count in counts.items():
+        print(f"shard {shard}: {count} cursors")
+
+
+if __name__ == "__main__":
+    main()
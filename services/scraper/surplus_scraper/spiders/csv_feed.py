@@ -16,6 +16,11 @@ class CsvFeedSpider(BaseSpider):
     state = "WA"
     county_code = "KING"
     source_system = "csv_feed_overages"
+    append_only = True
+
+    def extract_preamble(self, body: bytes) -> str:
+        header, _, _ = body.partition(b"\n")
+        return header.decode("utf-8") + "\n"
 
     def extract_listing_entries(self, response: scrapy.http.Response) -> List[str]:
         reader = csv.DictReader(io.StringIO(response.text))
@@ -28,7 +33,11 @@ class CsvFeedSpider(BaseSpider):
             sale_date = row.get("sale_date", "").strip()
             owner = row.get("owner", "").strip()
             address = row.get("address", "").strip()
-            amount = float(row.get("amount", 0) or 0)
+            try:
+                amount = float(row.get("amount", 0) or 0)
+            except ValueError:
+                self.quarantine(response, row, "amount must be a number")
+                continue
             status = (row.get("status") or "unknown").strip() or "unknown"
 
             normalized_case = {
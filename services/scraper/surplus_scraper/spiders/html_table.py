@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import re
-from typing import Iterable
+from typing import Dict, Iterable, Iterator
 
 import scrapy
 
 from surplus_scraper.base import BaseSpider
+from surplus_scraper.html_tables import iter_table_rows
 from surplus_scraper.items import NormalizedCaseResult
 
 
@@ -15,18 +16,33 @@ class HtmlTableSpider(BaseSpider):
     state = "TX"
     county_code = "TRAVIS"
     source_system = "html_table_overages"
+    table_id = "overages"
+    table_columns = {
+        "property_id": "Parcel",
+        "owner": "Owner",
+        "address": "Address",
+        "amount": "Amount",
+        "sale_date": "Sale Date",
+    }
+
+    def iter_table(self, response: scrapy.http.Response) -> Iterator[Dict[str, str]]:
+        return iter_table_rows(
+            response.body,
+            table_id=self.table_id,
+            columns=self.table_columns,
+            encoding=getattr(response, "encoding", None),
+        )
 
     def extract_listing_entries(self, response: scrapy.http.Response):
-        rows = response.css("table#overages tbody tr")
-        return [row.css("td::text").get(default="").strip() for row in rows]
+        return [row["property_id"] for row in self.iter_table(response)]
 
     def parse_records(self, response: scrapy.http.Response) -> Iterable[NormalizedCaseResult]:
-        for row in response.css("table#overages tbody tr"):
-            cells = [cell.strip() for cell in row.css("td::text").getall()]
-            if len(cells) < 5:
-                continue
-
-            property_id, owner, address, amount_text, sale_date = cells[:5]
+        for row in self.iter_table(response):
+            property_id = row["property_id"]
+            owner = row["owner"]
+            address = row["address"]
+            amount_text = row["amount"]
+            sale_date = row["sale_date"]
 
             normalized_case = {
                 "case_ref": f"HT-{property_id}",
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+CONTENT_RANGE_PATTERN = re.compile(r"^bytes\s+(?:(\d+)-(\d+)|\*)/(\d+|\*)$")
+
+
+@dataclass
+class ContentRange:
+    start: Optional[int]
+    end: Optional[int]
+    total: Optional[int]
+
+
+def parse_content_range(value: Optional[str]) -> Optional[ContentRange]:
+    if not value:
+        return None
+    match = CONTENT_RANGE_PATTERN.match(value.strip())
+    if not match:
+        return None
+    start, end, total = match.groups()
+    return ContentRange(
+        start=int(start) if start is not None else None,
+        end=int(end) if end is not None else None,
+        total=int(total) if total != "*" else None,
+    )
+
+
+def range_start(offset: int, check_bytes: int) -> int:
+    return max(offset - check_bytes, 0)
+
+
+def check_digest(window: bytes) -> str:
+    return hashlib.sha256(window).hexdigest()
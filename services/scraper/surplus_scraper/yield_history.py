@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Mapping
+
+DEFAULT_WINDOW = 10
+
+
+def surplus_total(normalized_case: Mapping[str, Any]) -> float:
+    return sum(entry.get("amount") or 0.0 for entry in normalized_case.get("amounts") or ())
+
+
+class YieldHistory:
+    """Per-URL record of what each crawl produced, used to order the next one.
+
+    Every fetched URL gets one entry per crawl with the number of items it
+    emitted and their summed surplus ``amounts``; unchanged responses count
+    as a crawl with zero yield. Only the last ``window`` crawls are kept.
+    """
+
+    def __init__(self, path: Path, window: int = DEFAULT_WINDOW) -> None:
+        self.path = path
+        self.window = window
+        self._lock = threading.Lock()
+        self._current: Dict[str, List[float]] = {}
+        self.crawls: Dict[str, List[Dict[str, float]]] = self._load()
+
+    def _load(self) -> Dict[str, List[Dict[str, float]]]:
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text())
+        except json.JSONDecodeError:
+            return {}
+
+    def touch(self, url: str) -> None:
+        with self._lock:
+            self._current.setdefault(url, [0, 0.0])
+
+    def record(self, url: str, normalized_case: Mapping[str, Any]) -> None:
+        with self._lock:
+            totals = self._current.setdefault(url, [0, 0.0])
+            totals[0] += 1
+            totals[1] += surplus_total(normalized_case)
+
+    def score(self, url: str) -> float:
+        """Recency-weighted surplus per crawl, with one point per item as a tie-breaker."""
+        crawls = self.crawls.get(url)
+        if not crawls:
+            return 0.0
+        weights = [0.5 ** (len(crawls) - 1 - position) for position in range(len(crawls))]
+        weighted = sum(weight * (crawl["amount"] + crawl["items"]) for weight, crawl in zip(weights, crawls))
+        return weighted / sum(weights)
+
+    def priorities(self, urls: List[str]) -> Dict[str, int]:
+        """Scrapy priorities on a log scale; URLs without history rank with the best known one."""
+        scores = {url: self.score(url) for url in urls if url in self.crawls}
+        best = max(scores.values(), default=0.0)
+        return {url: int(10 * math.log10(1 + scores.get(url, best))) for url in urls}
+
+    def commit(self) -> None:
+        with self._lock:
+            current, self._current = self._current, {}
+        if not current:
+            return
+        merged = defaultdict(list, self.crawls)
+        for url, (items, amount) in current.items():
+            merged[url] = (merged[url] + [{"items": items, "amount": round(amount, 2)}])[-self.window :]
+        self.crawls = dict(merged)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.crawls, indent=2))
+        os.replace(tmp_path, self.path)
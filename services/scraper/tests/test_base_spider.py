@@ -1,10 +1,16 @@
+import asyncio
 import json
+import threading
+from dataclasses import asdict
 from pathlib import Path
 
+import pytest
 from scrapy.http import Request, TextResponse
 
 from surplus_scraper.base import BaseSpider, Cursor
+from surplus_scraper.deadletter import read_dead_letters
 from surplus_scraper.items import NormalizedCaseResult
+from surplus_scraper.parse_pool import _worker_spiders, parse_artifact_in_process, serialize_response
 
 
 class DummyWatchSpider(BaseSpider):
@@ -92,3 +98,120 @@ def test_result_includes_sha(tmp_path, monkeypatch):
 
     assert validated.source["raw_sha256"]
     assert validated.source["url"] == url
+
+
+class PooledWatchSpider(DummyWatchSpider):
+    name = "pooled_watch"
+    parse_in_pool = True
+    parse_pool_batch_size = 2
+
+    def parse_records(self, response):
+        for index in range(5):
+            normalized_case = {
+                "case_ref": f"ABC-{index}",
+                "state": "TX",
+                "county_code": "201",
+                "source_system": "dummy",
+                "filed_at": "2023-12-31",
+                "status": "open",
+            }
+            yield self.wrap_normalized_case(normalized_case, response)
+
+
+class PartlyInvalidSpider(PooledWatchSpider):
+    name = "partly_invalid_watch"
+
+    def parse_records(self, response):
+        for index in range(3):
+            normalized_case = {
+                "case_ref": f"ABC-{index}",
+                "state": "TX",
+                "county_code": "201",
+                "source_system": "dummy",
+                "filed_at": "2023-12-31" if index != 1 else "31/12/2023",
+                "status": "open",
+            }
+            yield self.wrap_normalized_case(normalized_case, response)
+
+
+def collect(agen):
+    async def run():
+        return [item async for item in agen]
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("kind", ["thread", "process"])
+def test_parse_pool_streams_items_and_saves_cursor(tmp_path, monkeypatch, kind):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    spider = PooledWatchSpider(parse_pool_kind=kind)
+    url = spider.watch_urls[0]
+    body = (Path(__file__).parent / "fixtures" / "listing.html").read_bytes()
+
+    try:
+        items = collect(spider.parse_watch(build_response(body, url), Cursor()))
+        assert [item.normalized_case["case_ref"] for item in items] == [f"ABC-{i}" for i in range(5)]
+        assert spider._cursor_state[url].list_fingerprint
+
+        repeat = collect(spider.parse_watch(build_response(body, url), spider._cursor_state[url]))
+        assert repeat == []
+    finally:
+        spider.closed("finished")
+
+
+def test_worker_returns_quarantined_rows_and_uses_crawl_settings(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    url = PartlyInvalidSpider.watch_urls[0]
+    payload = serialize_response(build_response(b"<html><body>rows</body></html>", url))
+
+    _, outcomes, _ = parse_artifact_in_process(
+        PartlyInvalidSpider, {}, {"IDENTITY_INDEX_MODE": "suppress"}, payload, asdict(Cursor())
+    )
+
+    assert [outcome[0] for outcome in outcomes] == ["item", "quarantined", "item"]
+    assert outcomes[1][2] == "filed_at must be YYYY-MM-DD"
+    worker_spider = next(spider for spider in _worker_spiders.values() if isinstance(spider, PartlyInvalidSpider))
+    assert worker_spider.get_option("IDENTITY_INDEX_MODE", "identity_index_mode") == "suppress"
+    assert worker_spider._identity_index is None and worker_spider._dead_letter_sink is None
+
+
+@pytest.mark.parametrize("kind", ["thread", "process"])
+def test_pool_writes_dead_letters_and_stats_in_crawling_thread(tmp_path, monkeypatch, kind):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    spider = PartlyInvalidSpider(parse_pool_kind=kind)
+    url = spider.watch_urls[0]
+    stat_threads = set()
+    inc_stat = spider._inc_stat
+
+    def record_thread(key, count=1):
+        stat_threads.add(threading.current_thread())
+        inc_stat(key, count)
+
+    monkeypatch.setattr(spider, "_inc_stat", record_thread)
+
+    try:
+        items = collect(spider.parse_watch(build_response(b"<html><body>rows</body></html>", url), Cursor()))
+    finally:
+        spider.closed("finished")
+
+    assert [item.normalized_case["case_ref"] for item in items] == ["ABC-0", "ABC-2"]
+    assert [entry["reason"] for entry in read_dead_letters(spider.dead_letter_sink.path)] == [
+        "filed_at must be YYYY-MM-DD"
+    ]
+    assert spider._drain_stats()["rows/quarantined"] == 1
+    assert stat_threads == {threading.current_thread()}
+
+
+def test_rows_of_one_artifact_share_source_metadata(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    spider = DummyWatchSpider()
+    url = spider.watch_urls[0]
+    response = build_response(b"<html><body>content</body></html>", url)
+
+    first = spider.build_source_metadata(response)
+    second = spider.build_source_metadata(response, artifact_key="page-2")
+
+    assert (first.fetched_at, first.raw_sha256) == (second.fetched_at, second.raw_sha256)
+    assert second.artifact_key == "page-2"
+    other = spider.build_source_metadata(build_response(b"<html><body>other</body></html>", url))
+    assert other.raw_sha256 != first.raw_sha256
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import hashlib
 from pathlib import Path
 
+import pytest
 from scrapy.http import Request, Response, TextResponse
 
 from surplus_scraper.base import Cursor
+from surplus_scraper.deadletter import DeadLetterThresholdExceeded, read_dead_letters
 from surplus_scraper.items import NormalizedCaseResult
 from surplus_scraper.spiders.csv_feed import CsvFeedSpider
 from surplus_scraper.spiders.html_table import HtmlTableSpider
@@ -200,3 +203,117 @@ def test_csv_feed_spider_parses_rows(tmp_path, monkeypatch):
     cursor = spider._cursor_state[url]
     repeat_items = list(spider.parse_watch(build_text_response(fixture, url), cursor))
     assert repeat_items == []
+
+
+def test_csv_feed_quarantines_invalid_rows(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    spider = CsvFeedSpider()
+    url = spider.watch_urls[0]
+    fixture = Path(__file__).parent / "fixtures" / "csv_feed.csv"
+    feed = tmp_path / "feed.csv"
+    feed.write_text(
+        fixture.read_text()
+        + 'C9003,Bad Date,"1 Elm St, Seattle, WA 98103",10.00,02/30/2024,open\n'
+        + 'C9004,Bad Amount,"2 Elm St, Seattle, WA 98103",n/a,2024-02-20,open\n'
+    )
+
+    items = list(spider.parse_watch(build_text_response(feed, url), Cursor()))
+
+    assert [case["case_ref"] for case in normalize_results(items)] == ["CSV-C9001", "CSV-C9002"]
+    assert spider._cursor_state[url].list_fingerprint
+
+    spider.closed("finished")
+    dead_letters = list(read_dead_letters(tmp_path / spider.name / "dead_letter.jsonl"))
+    assert len(dead_letters) == 2
+    assert dead_letters[0]["case_ref"] == "CSV-C9003"
+    assert dead_letters[0]["reason"] == "filed_at must be YYYY-MM-DD"
+    assert dead_letters[1]["row"]["property_id"] == "C9004"
+    assert dead_letters[1]["reason"] == "amount must be a number"
+    assert spider._pending_stats["rows/quarantined"] == 2
+    assert spider._pending_stats["rows/valid"] == 2
+
+
+def test_csv_feed_aborts_when_error_rate_exceeded(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    spider = CsvFeedSpider(dead_letter_min_rows=3, dead_letter_max_error_rate=0.4)
+    url = spider.watch_urls[0]
+    feed = tmp_path / "feed.csv"
+    feed.write_text(
+        "property_id,owner,address,amount,sale_date,status\n"
+        + "".join(f'C{i},Owner,"1 Elm St, Seattle, WA 98103",1.00,bad-date,open\n' for i in range(5))
+    )
+
+    with pytest.raises(DeadLetterThresholdExceeded):
+        list(spider.parse_watch(build_text_response(feed, url), Cursor()))
+
+    assert url not in spider._cursor_state
+    assert spider._pending_stats["rows/quarantined"] == 3
+
+
+NEW_ROW = 'C9003,Nina Park,"9 Birch Ln, Seattle, WA 98103",980.00,2024-02-25,open\n'
+
+
+def build_range_response(url: str, body: bytes, start: int, total: int, status: int = 206) -> TextResponse:
+    headers = {b"Content-Range": f"bytes {start}-{start + len(body) - 1}/{total}".encode()}
+    return TextResponse(url=url, body=body, encoding="utf-8", request=Request(url=url), status=status, headers=headers)
+
+
+def test_csv_feed_resumes_appended_rows_with_range(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    spider = CsvFeedSpider(append_check_bytes=32)
+    url = spider.watch_urls[0]
+    original = (Path(__file__).parent / "fixtures" / "csv_feed.csv").read_bytes()
+    list(spider.parse_watch(build_text_response(Path(__file__).parent / "fixtures" / "csv_feed.csv", url), Cursor()))
+
+    cursor = spider._cursor_state[url]
+    assert cursor.append_offset == len(original)
+    request = list(CsvFeedSpider(append_check_bytes=32).start_requests())[0]
+    assert request.headers["Range"] == f"bytes={len(original) - 32}-".encode()
+    assert request.headers["Accept-Encoding"] == b"identity"
+
+    grown = original + NEW_ROW.encode()
+    start = len(original) - 32
+    items = list(spider.parse_watch(build_range_response(url, grown[start:], start, len(grown)), cursor))
+
+    assert [case["case_ref"] for case in normalize_results(items)] == ["CSV-C9003"]
+    assert items[0].source["raw_sha256"] == hashlib.sha256(grown[start:]).hexdigest()
+    assert spider._cursor_state[url].append_offset == len(grown)
+    assert spider._pending_stats["append/tail_fetches"] == 1
+
+
+def test_csv_feed_range_falls_back_when_prefix_rewritten(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    spider = CsvFeedSpider(append_check_bytes=32)
+    url = spider.watch_urls[0]
+    fixture = Path(__file__).parent / "fixtures" / "csv_feed.csv"
+    original = fixture.read_bytes()
+    list(spider.parse_watch(build_text_response(fixture, url), Cursor()))
+    cursor = spider._cursor_state[url]
+
+    rewritten = original.replace(b"closed", b"open!!") + NEW_ROW.encode()
+    start = len(original) - 32
+    outputs = list(spider.parse_watch(build_range_response(url, rewritten[start:], start, len(rewritten)), cursor))
+
+    assert len(outputs) == 1 and isinstance(outputs[0], Request)
+    assert "Range" not in outputs[0].headers
+    assert outputs[0].cb_kwargs["cursor"] == Cursor()
+
+
+def test_csv_feed_handles_server_ignoring_range(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    spider = CsvFeedSpider()
+    url = spider.watch_urls[0]
+    fixture = Path(__file__).parent / "fixtures" / "csv_feed.csv"
+    list(spider.parse_watch(build_text_response(fixture, url), Cursor()))
+    cursor = spider._cursor_state[url]
+
+    grown = fixture.read_bytes() + NEW_ROW.encode()
+    response = TextResponse(url=url, body=grown, encoding="utf-8", request=Request(url=url))
+    items = list(spider.parse_watch(response, cursor))
+
+    assert [case["case_ref"] for case in normalize_results(items)] == ["CSV-C9003"]
+    assert items[0].source["raw_sha256"] == hashlib.sha256(grown).hexdigest()
+
+    unchanged = build_range_response(url, b"", 0, len(grown), status=416)
+    unchanged.headers[b"Content-Range"] = f"bytes */{len(grown)}".encode()
+    assert list(spider.parse_watch(unchanged, spider._cursor_state[url])) == []
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+
+import pyarrow.parquet as pq
+import pytest
+
+from surplus_scraper.exporters import (
+    CompactJsonLinesItemExporter,
+    ParquetItemExporter,
+    expand_compact_feed,
+    read_compact_feed,
+)
+from surplus_scraper.items import NormalizedCaseResult
+
+
+def build_item(index: int) -> dict:
+    return NormalizedCaseResult.model_validate(
+        {
+            "normalized_case": {
+                "case_ref": f"CSV-C{index}",
+                "state": "WA",
+                "county_code": "KING",
+                "source_system": "csv_feed_overages",
+                "filed_at": "2024-02-10",
+                "sale_date": "2024-02-10",
+                "status": "open",
+                "property_address": {
+                    "line1": f"{index} Oak St",
+                    "city": "Seattle",
+                    "state": "WA",
+                    "county_code": "KING",
+                    "postal_code": "98101",
+                },
+                "parties": [
+                    {"role": "owner", "name": f"Owner {index}", "contact": {"phone": f"555-010{index}"}},
+                    {"role": "other", "name": "Claimant"},
+                ],
+                "amounts": [{"type": "surplus", "amount": 100.0 + index}, {"type": "fee", "amount": 5}],
+                "metadata": {"property_id": f"C{index}", "record_format": "csv_feed"},
+            },
+            "source": {
+                "url": "https://data.example.gov/overages/csv-feed",
+                "fetched_at": "2024-02-11T08:00:00+00:00",
+                "raw_sha256": "a" * 64,
+            },
+        }
+    ).model_dump()
+
+
+def test_parquet_exporter_writes_typed_row_groups(tmp_path):
+    path = tmp_path / "cases.parquet"
+    with path.open("wb") as handle:
+        exporter = ParquetItemExporter(handle, row_group_size=2)
+        exporter.start_exporting()
+        for index in range(5):
+            exporter.export_item(build_item(index))
+        exporter.finish_exporting()
+
+    parquet_file = pq.ParquetFile(path)
+    assert parquet_file.metadata.num_row_groups == 3
+    assert parquet_file.metadata.num_rows == 5
+
+    county_column = parquet_file.schema_arrow.get_field_index("county_code")
+    assert "RLE_DICTIONARY" in parquet_file.metadata.row_group(0).column(county_column).encodings
+
+    table = parquet_file.read()
+    first = table.slice(0, 1).to_pylist()[0]
+    assert first["case_ref"] == "CSV-C0"
+    assert first["filed_at"] == dt.date(2024, 2, 10)
+    assert first["property_city"] == "Seattle"
+    assert first["party_names"] == ["Owner 0", "Claimant"]
+    assert [json.loads(c) if c else c for c in first["party_contacts"]] == [{"phone": "555-0100"}, None]
+    assert first["amount_types"] == ["surplus", "fee"]
+    assert first["amount_values"] == [100.0, 5.0]
+    assert first["amount_total"] == 105.0
+    assert first["property_id"] == "C0"
+    assert first["source_fetched_at"] == dt.datetime(2024, 2, 11, 8, tzinfo=dt.timezone.utc)
+
+
+def test_compact_feed_writes_source_once_and_expands_back(tmp_path):
+    items = [build_item(index) for index in range(4)]
+    items[3] = dict(items[3], source=dict(items[3]["source"], url="https://data.example.gov/overages/other"))
+    path = tmp_path / "cases.jsonl"
+    with path.open("wb") as handle:
+        exporter = CompactJsonLinesItemExporter(handle)
+        exporter.start_exporting()
+        for item in items:
+            exporter.export_item(item)
+        exporter.finish_exporting()
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [sorted(record) for record in records] == [
+        ["source", "source_id"],
+        ["normalized_case", "source_ref"],
+        ["normalized_case", "source_ref"],
+        ["normalized_case", "source_ref"],
+        ["source", "source_id"],
+        ["normalized_case", "source_ref"],
+    ]
+    assert records[5]["source_ref"] == "1"
+    assert list(read_compact_feed(path)) == items
+
+
+def test_expand_compact_feed_passes_full_items_and_rejects_dangling_refs():
+    item = build_item(0)
+    assert list(expand_compact_feed([json.dumps(item), ""])) == [item]
+    with pytest.raises(ValueError):
+        list(expand_compact_feed([json.dumps({"normalized_case": {}, "source_ref": "9"})]))
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+
+from scrapy.http import Request, Response
+from scrapy.settings import Settings
+from scrapy.statscollectors import StatsCollector
+
+from surplus_scraper.base import BaseSpider
+from surplus_scraper.extensions import Budget, BudgetWatchdog
+
+
+class BudgetedSpider(BaseSpider):
+    name = "budgeted"
+    budget_max_bytes = 100
+    budget_max_items = 2
+
+
+class StubEngine:
+    def __init__(self):
+        self.closed = []
+
+    def close_spider(self, spider, reason):
+        self.closed.append(reason)
+
+
+def build_watchdog(settings: dict | None = None):
+    crawler = SimpleNamespace(settings=Settings(settings or {}), engine=StubEngine())
+    crawler.stats = StatsCollector(crawler)
+    return BudgetWatchdog(crawler), crawler
+
+
+def test_budget_reads_spider_attributes_and_settings(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    spider = BudgetedSpider()
+    assert Budget.for_spider(spider, Settings()) == Budget(max_bytes=100, max_items=2)
+
+    spider.settings = Settings({"BUDGET_MAX_ITEMS": "10"})
+    assert Budget.for_spider(spider, spider.settings).max_items == 10
+
+
+def test_watchdog_closes_spider_when_byte_budget_exceeded(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    spider = BudgetedSpider()
+    watchdog, crawler = build_watchdog()
+    watchdog.budget = Budget.for_spider(spider, crawler.settings)
+
+    request = Request(url="https://example.test/big")
+    watchdog.response_received(Response(url=request.url, body=b"x" * 60, request=request), request, spider)
+    assert crawler.engine.closed == []
+    watchdog.response_received(Response(url=request.url, body=b"x" * 60, request=request), request, spider)
+    watchdog.item_scraped({}, None, spider)
+    watchdog.item_scraped({}, None, spider)
+
+    assert crawler.engine.closed == ["budget_bytes"]
+    assert crawler.stats.get_value("budget/exceeded") == "bytes"
+
+
+def test_watchdog_checks_wall_time_and_rss(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    spider = BudgetedSpider()
+    watchdog, crawler = build_watchdog()
+
+    watchdog.budget = Budget(max_rss_mb=0.001)
+    watchdog.check(spider)
+    assert crawler.engine.closed == ["budget_rss"]
+    assert watchdog.rss_peak > 0
+
+    watchdog, crawler = build_watchdog()
+    watchdog.budget = Budget(max_seconds=1)
+    watchdog.started = time.monotonic() - 5
+    watchdog.check(spider)
+    assert crawler.engine.closed == ["budget_wall_time"]
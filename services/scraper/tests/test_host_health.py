@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+from scrapy.exceptions import IgnoreRequest
+from scrapy.http import Request, Response
+from scrapy.settings import Settings
+from scrapy.statscollectors import StatsCollector
+from twisted.internet.error import TimeoutError
+
+from surplus_scraper.base import BaseSpider
+from surplus_scraper.host_health import CLOSED, HALF_OPEN, OPEN, HostHealthTracker
+from surplus_scraper.middlewares import HostHealthMiddleware
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class WatchSpider(BaseSpider):
+    name = "host_watch"
+    watch_urls = ["https://down.example.test/a", "https://down.example.test/b"]
+    host_failure_threshold = 2
+    host_backoff_seconds = 60.0
+
+
+def test_tracker_opens_probes_and_backs_off(tmp_path):
+    clock = Clock()
+    tracker = HostHealthTracker(tmp_path / "host_health.json", failure_threshold=2, backoff=60, clock=clock)
+
+    tracker.record_failure("county.test", "TimeoutError")
+    assert tracker.allow("county.test")
+    tracker.record_failure("county.test", "TimeoutError")
+    assert tracker.hosts["county.test"].state == OPEN
+    assert not tracker.allow("county.test")
+
+    clock.now += 61
+    assert tracker.allow("county.test")
+    assert tracker.hosts["county.test"].state == HALF_OPEN
+    assert not tracker.allow("county.test"), "only one probe while half-open"
+
+    tracker.record_failure("county.test", "HTTP 503")
+    assert tracker.hosts["county.test"].open_until == clock.now + 120
+
+    clock.now += 121
+    assert tracker.allow("county.test")
+    tracker.record_success("county.test", latency=0.5)
+    assert tracker.hosts["county.test"].state == CLOSED
+    assert tracker.hosts["county.test"].open_count == 0
+    assert [(previous, current) for _, previous, current in tracker.drain_transitions()] == [
+        (CLOSED, OPEN),
+        (OPEN, HALF_OPEN),
+        (HALF_OPEN, OPEN),
+        (OPEN, HALF_OPEN),
+        (HALF_OPEN, CLOSED),
+    ]
+
+
+def test_tracker_persists_state_and_latency(tmp_path):
+    path = tmp_path / "host_health.json"
+    tracker = HostHealthTracker(path, failure_threshold=1)
+    tracker.record_success("fast.test", latency=1.0)
+    tracker.record_success("fast.test", latency=2.0)
+    tracker.record_failure("down.test", "DNSLookupError")
+    tracker.save()
+
+    reloaded = HostHealthTracker(path, failure_threshold=1)
+    assert reloaded.hosts["fast.test"].latency == pytest.approx(1.3)
+    assert reloaded.hosts["down.test"].state == OPEN
+    assert reloaded.hosts["down.test"].last_error == "DNSLookupError"
+    assert not reloaded.allow("down.test")
+
+
+def test_middleware_skips_open_hosts_and_records_transitions(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    spider = WatchSpider()
+    stats = StatsCollector(SimpleNamespace(settings=Settings()))
+    middleware = HostHealthMiddleware(stats)
+
+    first, second = (Request(url) for url in spider.watch_urls)
+    middleware.process_request(first, spider)
+    middleware.process_exception(first, TimeoutError(), spider)
+    failed = Response(url=second.url, status=503, request=second)
+    assert middleware.process_response(second, failed, spider) is failed
+
+    with pytest.raises(IgnoreRequest):
+        middleware.process_request(Request(spider.watch_urls[0]), spider)
+    assert stats.get_value("host_health/closed_to_open") == 1
+    assert stats.get_value("host_health/skipped_requests") == 1
+    assert (spider.state_dir / "host_health.json").exists()
+
+    other = Request("https://up.example.test/c", meta={"download_latency": 0.2})
+    middleware.process_request(other, spider)
+    middleware.process_response(other, Response(url=other.url, status=304, request=other), spider)
+    assert spider.host_health.hosts["up.example.test"].latency == 0.2
+
+    spider.closed("finished")
+    assert spider._drain_stats()["host_health/open_hosts"] == 1
+    assert WatchSpider().host_health.hosts["down.example.test"].state == OPEN
+
+
+def test_middleware_holds_requests_until_the_probe_finishes(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    spider = WatchSpider()
+    stats = StatsCollector(SimpleNamespace(settings=Settings()))
+    middleware = HostHealthMiddleware(stats)
+    clock = Clock()
+    spider.host_health.clock = clock
+    for _ in range(2):
+        spider.host_health.record_failure("down.example.test", "TimeoutError")
+    clock.now += 61
+
+    probe, *waiting = (Request(f"https://down.example.test/{index}") for index in range(3))
+    assert middleware.process_request(probe, spider) is None
+    held = [middleware.process_request(request, spider) for request in waiting]
+    assert not any(deferred.called for deferred in held)
+    assert stats.get_value("host_health/held_requests") == 2
+
+    middleware.process_response(probe, Response(url=probe.url, status=200, request=probe), spider)
+    assert [deferred.result for deferred in held] == [None, None]
+    assert stats.get_value("host_health/skipped_requests") is None
+
+    spider.host_health.record_failure("down.example.test", "TimeoutError")
+    spider.host_health.record_failure("down.example.test", "TimeoutError")
+    clock.now += 3600
+    probe, waiting = Request("https://down.example.test/p"), Request("https://down.example.test/w")
+    middleware.process_request(probe, spider)
+    held = middleware.process_request(waiting, spider)
+    middleware.process_exception(probe, TimeoutError(), spider)
+    failures = []
+    held.addErrback(failures.append)
+    assert failures[0].check(IgnoreRequest)
+    assert stats.get_value("host_health/skipped_requests") == 1
+
+
+def test_dropped_probe_hands_over_to_a_held_request(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    spider = WatchSpider()
+    middleware = HostHealthMiddleware(StatsCollector(SimpleNamespace(settings=Settings())))
+    clock = Clock()
+    spider.host_health.clock = clock
+    for _ in range(2):
+        spider.host_health.record_failure("down.example.test", "TimeoutError")
+    clock.now += 61
+
+    probe, waiting = Request("https://down.example.test/p"), Request("https://down.example.test/w")
+    middleware.process_request(probe, spider)
+    held = middleware.process_request(waiting, spider)
+    middleware.process_exception(probe, IgnoreRequest(), spider)
+
+    assert held.called and held.result is None
+    assert waiting.meta["host_health_probe"]
+    assert spider.host_health.hosts["down.example.test"].state == HALF_OPEN
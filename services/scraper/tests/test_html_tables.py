@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import pytest
+
+from surplus_scraper.html_tables import iter_table_rows
+
+TABLES = b"""
+<html><body>
+  <table id="other"><tr><th>Parcel</th></tr><tr><td>IGNORED</td></tr></table>
+  <table id="overages">
+    <thead><tr><th>Sale  Date</th><th>Parcel</th><th>Owner</th></tr></thead>
+    <tbody>
+      <tr><td>2024-03-01</td><td><a href="/p/R1">R1</a></td><td>Jane <b>Doe</b></td></tr>
+      <tr><td>2024-03-02</td><td>R2</td></tr>
+      <tr><td>2024-03-03</td><td>R3</td><td>Sam Taylor</td></tr>
+    </tbody>
+  </table>
+</body></html>
+"""
+
+COLUMNS = {"property_id": "Parcel", "owner": "Owner", "sale_date": "Sale Date"}
+
+
+def test_rows_are_mapped_by_header_text():
+    rows = list(iter_table_rows(TABLES, table_id="overages", columns=COLUMNS, chunk_size=16))
+
+    assert rows == [
+        {"property_id": "R1", "owner": "Jane Doe", "sale_date": "2024-03-01"},
+        {"property_id": "R3", "owner": "Sam Taylor", "sale_date": "2024-03-03"},
+    ]
+
+
+def test_rows_without_columns_are_keyed_by_normalized_header():
+    rows = list(iter_table_rows(TABLES, table_id="other"))
+
+    assert rows == [{"parcel": "IGNORED"}]
+
+
+def test_explicit_headers_for_headerless_tables():
+    body = b"<table><tr><td>A1</td><td>B1</td></tr><tr><td>A2</td><td>B2</td></tr></table>"
+
+    rows = list(iter_table_rows(body, headers=["Left", "Right"], columns={"a": "left", "b": "right"}))
+
+    assert rows == [{"a": "A1", "b": "B1"}, {"a": "A2", "b": "B2"}]
+
+
+def test_missing_header_column_raises():
+    with pytest.raises(ValueError, match="amount"):
+        list(iter_table_rows(TABLES, table_id="overages", columns={"amount": "Amount"}))
+
+
+def test_missing_table_yields_nothing():
+    assert list(iter_table_rows(TABLES, table_id="absent")) == []
+
+
+def test_td_header_row_in_tbody_is_recognised():
+    body = (
+        b"<table><tbody><tr><td>Parcel</td><td>Owner</td></tr>"
+        b"<tr><td>R9</td><td>Ann Lee</td></tr></tbody></table>"
+    )
+
+    rows = list(iter_table_rows(body, columns={"property_id": "Parcel", "owner": "Owner"}))
+
+    assert rows == [{"property_id": "R9", "owner": "Ann Lee"}]
+
+
+def test_table_without_header_row_raises():
+    body = b"<table><tbody><tr><td>R9</td><td>Ann Lee</td></tr></tbody></table>"
+
+    with pytest.raises(ValueError, match="no header row"):
+        list(iter_table_rows(body, columns={"property_id": "Parcel"}))
+    with pytest.raises(ValueError, match="no header row"):
+        list(iter_table_rows(body[:-8], columns={"property_id": "Parcel"}))
+
+
+def test_empty_body_yields_nothing():
+    assert list(iter_table_rows(b"", columns=COLUMNS)) == []
+    assert list(iter_table_rows(b"  \n", columns=COLUMNS)) == []
+
+
+def rows_of(body: bytes):
+    return list(iter_table_rows(body, columns={"property_id": "Parcel", "owner": "Owner"}))
+
+
+def test_repeated_th_header_rows_in_tbody_are_skipped():
+    body = (
+        b"<table><thead><tr><th>Parcel</th><th>Owner</th></tr></thead><tbody>"
+        b"<tr><td>R1</td><td>Ann Lee</td></tr><tr><th>Parcel</th><th>Owner</th></tr>"
+        b"<tr><td>R2</td><td>Bo Chan</td></tr></tbody></table>"
+    )
+
+    assert rows_of(body) == [{"property_id": "R1", "owner": "Ann Lee"}, {"property_id": "R2", "owner": "Bo Chan"}]
+
+
+def test_extra_thead_and_tfoot_rows_are_skipped():
+    body = (
+        b"<table><thead><tr><th>Parcel</th><th>Owner</th></tr><tr><td>filter</td><td>any</td></tr></thead>"
+        b"<tbody><tr><td>R1</td><td>Ann Lee</td></tr></tbody>"
+        b"<tfoot><tr><td>Total</td><td>1</td></tr></tfoot></table>"
+    )
+
+    assert rows_of(body) == [{"property_id": "R1", "owner": "Ann Lee"}]
+
+
+def test_td_rows_repeating_the_header_text_are_skipped():
+    body = (
+        b"<table><tr><td>Parcel</td><td>Owner</td></tr><tr><td>R1</td><td>Ann Lee</td></tr>"
+        b"<tr><td>PARCEL</td><td>Owner </td></tr><tr><td>R2</td><td>Bo Chan</td></tr></table>"
+    )
+
+    assert rows_of(body) == [{"property_id": "R1", "owner": "Ann Lee"}, {"property_id": "R2", "owner": "Bo Chan"}]
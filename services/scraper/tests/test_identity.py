@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+from scrapy.http import Request, TextResponse
+
+from surplus_scraper.base import Cursor
+from surplus_scraper.identity import BloomFilter, IdentityIndex, bloom_capacity_for, identity_keys
+from surplus_scraper.spiders.csv_feed import CsvFeedSpider
+from surplus_scraper.spiders.html_table import HtmlTableSpider
+
+
+def case(**overrides) -> dict:
+    payload = {
+        "case_ref": "HT-R1001",
+        "state": "TX",
+        "county_code": "TRAVIS",
+        "source_system": "html_table_overages",
+        "filed_at": "2024-03-01",
+        "sale_date": "2024-03-01",
+        "property_address": {"line1": "123 Main Street", "city": "Austin", "state": "TX", "county_code": "TRAVIS"},
+        "metadata": {"property_id": "R-1001"},
+    }
+    payload.update(overrides)
+    return payload
+
+
+def test_identity_keys_normalize_address_and_parcel():
+    variant = case(
+        property_address={"line1": "123 MAIN ST.", "city": "AUSTIN", "state": "TX", "county_code": "453"},
+        metadata={"property_id": "r1001"},
+    )
+
+    assert identity_keys(case()) == identity_keys(variant)
+    assert identity_keys(case()) != identity_keys(case(sale_date="2024-04-01"))
+    assert identity_keys(case(property_address=None, metadata=None)) == []
+
+
+def test_parcel_key_is_scoped_by_locality():
+    travis = case(property_address=None)
+    harris = case(property_address=None, county_code="HARRIS")
+    assert len(identity_keys(travis)) == 1
+    assert identity_keys(travis) != identity_keys(harris)
+
+    dallas = case(property_address={"line1": "9 Elm St", "city": "Dallas", "state": "TX"})
+    assert not set(identity_keys(case())) & set(identity_keys(dallas))
+
+
+def test_index_reports_cross_source_duplicates_and_persists(tmp_path):
+    path = tmp_path / "identity.sqlite3"
+    index = IdentityIndex(path, bloom_capacity=1000)
+    keys = identity_keys(case())
+
+    assert index.observe(keys, "HT-R1001", "html_table_overages") is None
+    assert index.observe(keys, "HT-R1001", "html_table_overages") is None
+    assert index.observe(keys, "CSV-9", "csv_feed_overages") == ("HT-R1001", "html_table_overages")
+    index.close()
+    assert path.with_suffix(".bloom").exists()
+
+    reopened = IdentityIndex(path, bloom_capacity=1000)
+    assert reopened.observe(keys, "PDF-1", "pdf_list_overages") == ("HT-R1001", "html_table_overages")
+    other = identity_keys(case(sale_date="2025-01-01"))
+    assert reopened.observe(other, "PDF-2", "pdf_list_overages") is None
+    reopened.close()
+
+    without_bloom = IdentityIndex(path, bloom_capacity=0)
+    assert without_bloom.observe(other, "CSV-2", "csv_feed_overages") == ("PDF-2", "pdf_list_overages")
+    without_bloom.close()
+
+
+def test_bloom_is_rebuilt_when_another_process_added_rows(tmp_path):
+    path = tmp_path / "identity.sqlite3"
+    first = IdentityIndex(path, bloom_capacity=1000)
+    first.close()
+
+    writer = IdentityIndex(path, bloom_capacity=0)
+    writer.observe(identity_keys(case()), "HT-R1001", "html_table_overages")
+    writer.close()
+
+    reader = IdentityIndex(path, bloom_capacity=1000)
+    assert reader.observe(identity_keys(case()), "CSV-9", "csv_feed_overages") == ("HT-R1001", "html_table_overages")
+    reader.close()
+
+
+def test_bloom_catch_up_only_reads_rows_added_since_it_was_saved(tmp_path):
+    path = tmp_path / "identity.sqlite3"
+    first = IdentityIndex(path, bloom_capacity=1000)
+    for index in range(50):
+        first.observe(identity_keys(case(sale_date=f"2024-01-{index % 28 + 1:02d}", case_ref=f"A{index}")), "A", "a")
+    first.close()
+
+    # The first run's own rows are above the watermark it loaded at.
+    total = sqlite3.connect(path).execute("SELECT COUNT(*) FROM identities").fetchone()[0]
+    caught_up = IdentityIndex(path, bloom_capacity=1000)
+    assert caught_up.bloom_ready.wait(5)
+    assert caught_up.bloom_keys_loaded == total
+    caught_up.close()
+
+    writer = IdentityIndex(path, bloom_capacity=0)
+    writer.observe(identity_keys(case(sale_date="2030-01-01")), "HT-R9", "html_table_overages")
+    writer.close()
+
+    reader = IdentityIndex(path, bloom_capacity=1000)
+    assert reader.bloom_ready.wait(5)
+    assert reader.bloom_keys_loaded == 2
+    duplicate = reader.observe(identity_keys(case(sale_date="2030-01-01")), "CSV-9", "csv_feed_overages")
+    assert duplicate == ("HT-R9", "html_table_overages")
+    reader.close()
+
+
+def test_bloom_is_sized_from_row_count():
+    assert bloom_capacity_for(100, 1000) == 1000
+    assert bloom_capacity_for(3000, 1000) == 8000
+
+
+def test_index_migrates_tables_without_sequence_column(tmp_path):
+    path = tmp_path / "identity.sqlite3"
+    keys = identity_keys(case())
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE identities (key BLOB PRIMARY KEY, case_ref TEXT NOT NULL, source_system TEXT NOT NULL) "
+        "WITHOUT ROWID"
+    )
+    conn.execute("INSERT INTO identities VALUES (?, 'HT-R1001', 'html_table_overages')", (keys[0],))
+    conn.commit()
+    conn.close()
+
+    index = IdentityIndex(path, bloom_capacity=1000)
+    assert index.observe(keys, "CSV-9", "csv_feed_overages") == ("HT-R1001", "html_table_overages")
+    index.close()
+
+
+def test_spiders_annotate_or_suppress_cross_source_duplicates(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    fixtures = Path(__file__).parent / "fixtures"
+
+    html = HtmlTableSpider(identity_bloom_capacity=1000)
+    url = html.watch_urls[0]
+    html_body = (fixtures / "html_table.html").read_bytes()
+    response = TextResponse(url=url, body=html_body, encoding="utf-8", request=Request(url=url))
+    list(html.parse_watch(response, Cursor()))
+    html.closed("finished")
+
+    body = (
+        b"property_id,owner,address,amount,sale_date,status\n"
+        b'T1,Jane Doe,"123 Main Street, Austin, TX 78701",1250.75,2024-03-01,open\n'
+    )
+    csv_url = CsvFeedSpider.watch_urls[0]
+
+    def csv_response():
+        return TextResponse(url=csv_url, body=body, encoding="utf-8", request=Request(url=csv_url))
+
+    annotate = CsvFeedSpider(identity_bloom_capacity=1000)
+    items = list(annotate.parse_watch(csv_response(), Cursor()))
+    annotate.closed("finished")
+
+    assert items[0].normalized_case["metadata"]["duplicate_of"] == {
+        "case_ref": "HT-R1001",
+        "source_system": "html_table_overages",
+    }
+
+    suppress = CsvFeedSpider(identity_bloom_capacity=1000, identity_index_mode="suppress")
+    items = list(suppress.parse_watch(csv_response(), Cursor()))
+    suppress.closed("finished")
+
+    assert items == []
+    assert suppress._pending_stats["identity/suppressed"] == 1
+
+
+def test_bloom_save_uses_a_private_temp_file(tmp_path, monkeypatch):
+    path = tmp_path / "identity.bloom"
+    bloom = BloomFilter(100)
+    bloom.add(b"k" * 16)
+    replaced = []
+    original = Path.replace
+
+    def record(self, target):
+        replaced.append(self)
+        return original(self, target)
+
+    monkeypatch.setattr(Path, "replace", record)
+    bloom.save(path, 7)
+    bloom.save(path, 8)
+
+    assert replaced[0] != replaced[1]
+    assert all(source.parent == tmp_path for source in replaced)
+    assert list(tmp_path.iterdir()) == [path]
+    assert BloomFilter(100).load(path) == 8
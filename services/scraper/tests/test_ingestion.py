@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+from scrapy.settings import Settings
+from scrapy.statscollectors import StatsCollector
+from twisted.internet import defer, task
+
+from surplus_scraper.deadletter import read_dead_letters
+from surplus_scraper.ingestion import IngestionClient, IngestionError, IngestionRejected, SpillStore
+from surplus_scraper.pipelines import IngestionPushPipeline
+
+
+class StandInServer:
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.batches = []
+        self.connections = set()
+        self.headers = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                server.batches.append(json.loads(self.rfile.read(length)))
+                server.connections.add(self.client_address)
+                server.headers.append(dict(self.headers))
+                status = server.statuses.pop(0) if server.statuses else 202
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/ingest"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def test_batches_reuse_keep_alive_connection():
+    with StandInServer([]) as server:
+        client = IngestionClient(server.url, token="secret", pool_size=1)
+        for index in range(3):
+            assert client.post_batch("csv_feed_overages", [{"n": index}]) == 0
+        client.close()
+
+    assert [batch["items"] for batch in server.batches] == [[{"n": 0}], [{"n": 1}], [{"n": 2}]]
+    assert len(server.connections) == 1
+    assert server.headers[0]["Authorization"] == "Bearer secret"
+
+
+def test_retries_server_errors_then_succeeds():
+    delays = []
+    with StandInServer([503, 500]) as server:
+        client = IngestionClient(server.url, retries=3, backoff=0.5, sleep=delays.append)
+        assert client.post_batch("csv_feed_overages", [{"n": 1}]) == 2
+        client.close()
+
+    assert delays == [0.5, 1.0]
+    assert len(server.batches) == 3
+
+
+def test_client_errors_are_not_retried():
+    with StandInServer([400]) as server:
+        client = IngestionClient(server.url, retries=3, sleep=lambda _: None)
+        with pytest.raises(IngestionRejected, match="HTTP 400"):
+            client.post_batch("csv_feed_overages", [{"n": 1}])
+        client.close()
+
+    assert len(server.batches) == 1
+
+
+def test_auth_and_path_errors_fail_without_rejecting():
+    for status in (401, 403, 404):
+        with StandInServer([status]) as server:
+            client = IngestionClient(server.url, retries=3, sleep=lambda _: None)
+            with pytest.raises(IngestionError, match=f"HTTP {status}") as raised:
+                client.post_batch("csv_feed_overages", [{"n": 1}])
+            client.close()
+
+        assert not isinstance(raised.value, IngestionRejected)
+        assert len(server.batches) == 1
+
+
+def test_unreachable_endpoint_raises_after_retries():
+    with StandInServer([]) as server:
+        url = server.url
+    client = IngestionClient(url, retries=1, timeout=1.0, sleep=lambda _: None)
+
+    with pytest.raises(IngestionError):
+        client.post_batch("csv_feed_overages", [{"n": 1}])
+
+
+def test_spill_store_round_trip(tmp_path):
+    spill = SpillStore(tmp_path / "spill")
+    first = spill.write("csv_feed_overages", [{"n": 1}])
+    spill.write("csv_feed_overages", [{"n": 2}])
+
+    assert spill.pending()[0] == first
+    assert SpillStore.load(first) == ("csv_feed_overages", [{"n": 1}])
+
+
+class InlineThreads:
+    """Stands in for twisted.internet.threads; sends run when released."""
+
+    def __init__(self, hold: bool = False):
+        self.hold = hold
+        self.waiting = []
+
+    def deferToThread(self, fn, *args):
+        if not self.hold:
+            return defer.maybeDeferred(fn, *args)
+        deferred = defer.Deferred()
+        self.waiting.append((deferred, fn, args))
+        return deferred
+
+    def release_one(self):
+        deferred, fn, args = self.waiting.pop(0)
+        deferred.callback(fn(*args))
+
+
+def build_pipeline(monkeypatch, tmp_path, server, threads=None, **kwargs):
+    clock = task.Clock()
+    monkeypatch.setattr("surplus_scraper.pipelines.threads", threads or InlineThreads())
+    monkeypatch.setattr("surplus_scraper.pipelines.time", SimpleNamespace(monotonic=clock.seconds))
+    stats = StatsCollector(SimpleNamespace(settings=Settings()))
+    client = IngestionClient(server.url, retries=0, sleep=lambda _: None)
+    pipeline = IngestionPushPipeline(client, stats, **kwargs)
+    pipeline._flush_task.clock = clock
+    pipeline.open_spider(SimpleNamespace(name="csv_feed_overages", state_dir=tmp_path))
+    return pipeline, clock, stats
+
+
+def case(index):
+    return {"normalized_case": {"case_ref": f"C{index}"}, "source": {"url": "https://example.test"}}
+
+
+def test_pipeline_batches_by_size_and_age(tmp_path, monkeypatch):
+    with StandInServer([]) as server:
+        pipeline, clock, stats = build_pipeline(monkeypatch, tmp_path, server, batch_size=2, max_age=1.0)
+        for index in range(3):
+            pipeline.process_item(case(index), None)
+        assert len(server.batches) == 1
+        clock.advance(1.0)
+        pipeline.close_spider(None)
+
+    assert [[item["normalized_case"]["case_ref"] for item in batch["items"]] for batch in server.batches] == [
+        ["C0", "C1"],
+        ["C2"],
+    ]
+    assert stats.get_value("ingest/items_sent") == 3
+
+
+def test_pipeline_bounds_batches_in_flight(tmp_path, monkeypatch):
+    threads = InlineThreads(hold=True)
+    with StandInServer([]) as server:
+        pipeline, _, stats = build_pipeline(monkeypatch, tmp_path, server, threads, batch_size=1, max_in_flight=2)
+        held = [pipeline.process_item(case(index), None) for index in range(3)]
+        assert [deferred.called for deferred in held] == [True, True, False]
+        assert len(threads.waiting) == 2
+
+        threads.release_one()
+        assert held[2].called and len(threads.waiting) == 2
+        while threads.waiting:
+            threads.release_one()
+        pipeline.close_spider(None)
+
+    assert stats.get_value("ingest/batches_sent") == 3
+
+
+def test_pipeline_spills_outages_and_replays_on_open(tmp_path, monkeypatch):
+    with StandInServer([503]) as server:
+        pipeline, _, stats = build_pipeline(monkeypatch, tmp_path, server, batch_size=2)
+        pipeline.process_item(case(0), None)
+        pipeline.process_item(case(1), None)
+        pipeline.close_spider(None)
+        assert stats.get_value("ingest/items_spilled") == 2
+        assert len(pipeline.spill.pending()) == 1
+
+        replaying, _, replay_stats = build_pipeline(monkeypatch, tmp_path, server, batch_size=2)
+        replaying.close_spider(None)
+
+    assert server.batches[1] == server.batches[0]
+    assert replay_stats.get_value("ingest/batches_replayed") == 1
+    assert replaying.spill.pending() == []
+
+
+def test_pipeline_dead_letters_rejected_batches_instead_of_spilling(tmp_path, monkeypatch):
+    with StandInServer([422]) as server:
+        pipeline, _, stats = build_pipeline(monkeypatch, tmp_path, server, batch_size=2)
+        pipeline.process_item(case(0), None)
+        pipeline.process_item(case(1), None)
+        pipeline.close_spider(None)
+
+    assert pipeline.spill.pending() == []
+    rejected = list(read_dead_letters(tmp_path / "ingest_spill" / "rejected.jsonl"))
+    assert [entry["case_ref"] for entry in rejected] == ["C0", "C1"]
+    assert "HTTP 422" in rejected[0]["reason"]
+    assert stats.get_value("ingest/batches_rejected") == 1
+    assert stats.get_value("ingest/items_rejected") == 2
+
+
+def test_pipeline_spills_batches_refused_for_bad_credentials(tmp_path, monkeypatch):
+    with StandInServer([401]) as server:
+        pipeline, _, stats = build_pipeline(monkeypatch, tmp_path, server, batch_size=1)
+        pipeline.process_item(case(0), None)
+        pipeline.close_spider(None)
+
+    assert len(pipeline.spill.pending()) == 1
+    assert stats.get_value("ingest/items_spilled") == 1
+    assert stats.get_value("ingest/batches_rejected") is None
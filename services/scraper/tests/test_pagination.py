@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from scrapy.http import Request, TextResponse
+
+from surplus_scraper.base import BaseSpider
+from surplus_scraper.pagination import PaginatedWatch, PaginationRun
+
+
+class PagedSpider(BaseSpider):
+    name = "paged_watch"
+    paginated_watches = [PaginatedWatch(url="https://example.test/list?page={page}", max_pages=50)]
+    pagination_concurrency = 3
+
+    def extract_listing_entries(self, response):
+        return [text.strip() for text in response.css("li::text").getall() if text.strip()]
+
+    def parse_records(self, response):
+        for entry in self.extract_listing_entries(response):
+            if entry == "BOOM":
+                raise RuntimeError("unparseable page")
+            normalized_case = {
+                "case_ref": f"PG-{entry}",
+                "state": "TX",
+                "county_code": "201",
+                "source_system": "paged",
+                "filed_at": "bad" if entry.startswith("BAD") else "2024-01-01",
+                "status": "open",
+            }
+            yield self.wrap_normalized_case(normalized_case, response)
+
+
+class RowsOnlySpider(PagedSpider):
+    name = "paged_rows_only"
+    identity_index_mode = "off"
+
+    def extract_listing_entries(self, response):
+        return []
+
+    def parse_records(self, response):
+        entries = [text.strip() for text in response.css("li::text").getall() if text.strip()]
+        for entry in entries:
+            normalized_case = {
+                "case_ref": f"PG-{entry}",
+                "state": "TX",
+                "county_code": "201",
+                "source_system": "paged",
+                "filed_at": "bad" if entry.startswith("BAD") else "2024-01-01",
+                "status": "open",
+            }
+            yield self.wrap_normalized_case(normalized_case, response)
+
+
+def page_response(request: Request, entries: list[str], status: int = 200) -> TextResponse:
+    body = "<ul>" + "".join(f"<li>{entry}</li>" for entry in entries) + "</ul>"
+    return TextResponse(url=request.url, body=body.encode(), encoding="utf-8", request=request, status=status)
+
+
+def call(request: Request, response: TextResponse):
+    return list(request.callback(response, **request.cb_kwargs))
+
+
+def test_run_stops_when_leading_pages_unchanged():
+    run = PaginationRun(PaginatedWatch(url="https://example.test/{page}", max_pages=50), leading_pages=2)
+
+    assert run.start() == [1, 2]
+    assert run.complete(1, changed=False) == []
+    assert run.complete(2, changed=False) == []
+    assert run.stopped
+
+
+def test_run_fans_out_with_concurrency_limit_and_stops_at_end():
+    run = PaginationRun(PaginatedWatch(url="https://example.test/{page}", max_pages=10), leading_pages=1, concurrency=3)
+
+    assert run.start() == [1]
+    assert run.complete(1, changed=True) == [2, 3, 4]
+    assert run.complete(2, changed=True) == [5]
+    assert run.complete(5, changed=False, exhausted=True) == []
+    assert run.complete(3, changed=True) == []
+    assert run.next_page == 6 and run.last_page == 4
+
+
+def test_paginated_watch_crawls_pages_and_skips_unchanged_listing(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    spider = PagedSpider()
+    pages = {1: ["A", "B"], 2: ["C"], 3: ["D"], 4: []}
+
+    queue = list(spider.start_requests())
+    assert [request.url for request in queue] == [
+        "https://example.test/list?page=1",
+        "https://example.test/list?page=2",
+    ]
+
+    items = []
+    while queue:
+        request = queue.pop(0)
+        page = request.cb_kwargs["page"]
+        for output in call(request, page_response(request, pages.get(page, []))):
+            (queue if isinstance(output, Request) else items).append(output)
+
+    assert sorted(item.normalized_case["case_ref"] for item in items) == ["PG-A", "PG-B", "PG-C", "PG-D"]
+    assert spider._pending_stats["pagination/pages_requested"] == 6
+    assert spider._cursor_state["https://example.test/list?page=3"].list_fingerprint
+
+    rerun = PagedSpider()
+    leading = list(rerun.start_requests())
+    assert all(request.cb_kwargs["cursor"].list_fingerprint for request in leading)
+    for request in leading:
+        assert call(request, page_response(request, pages[request.cb_kwargs["page"]])) == []
+    assert rerun._pending_stats["pagination/early_stops"] == 1
+
+
+def crawl(spider, pages):
+    queue = list(spider.start_requests())
+    fetched, items = [], []
+    while queue:
+        request = queue.pop(0)
+        page = request.cb_kwargs["page"]
+        fetched.append(page)
+        outputs = request.callback(page_response(request, pages.get(page, [])), **request.cb_kwargs)
+        try:
+            for output in outputs:
+                (queue if isinstance(output, Request) else items).append(output)
+        except RuntimeError:
+            pass
+    return sorted(fetched), items
+
+
+def test_page_with_only_invalid_rows_does_not_end_listing(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    pages = {page: [f"E{page}"] for page in range(1, 13)}
+    pages[2] = ["BAD-1"]
+
+    fetched, items = crawl(RowsOnlySpider(), pages)
+
+    # Pages 14 and 15 were already in flight when page 13 came back empty.
+    assert fetched == list(range(1, 16))
+    assert len(items) == 11
+
+
+def test_unchanged_empty_page_still_ends_listing(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    pages = {1: ["A"], 2: ["B"], 3: ["C"]}
+    crawl(RowsOnlySpider(), pages)
+    assert RowsOnlySpider()._cursor_state["https://example.test/list?page=4"].page_rows == 0
+
+    pages[1] = ["A", "A2"]
+    fetched, _ = crawl(RowsOnlySpider(), pages)
+    assert fetched == [1, 2, 3, 4, 5, 6]
+
+
+def test_parse_error_still_advances_pagination(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    fetched, _ = crawl(PagedSpider(), {1: ["A"], 2: ["BOOM"], 3: ["C"]})
+    assert fetched == [1, 2, 3, 4, 5, 6]
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from surplus_scraper.base import BaseSpider, Cursor
+from surplus_scraper.deadletter import read_dead_letters
+from surplus_scraper.ingestion import SpillStore
+from surplus_scraper.pagination import PaginatedWatch
+from surplus_scraper.sharding import HashRing, main, rebalance
+
+URLS = [f"https://county-{index}.example.gov/overages" for index in range(200)]
+
+
+class ShardedSpider(BaseSpider):
+    name = "sharded_watch"
+    watch_urls = URLS
+
+
+def test_ring_splits_every_url_to_exactly_one_shard():
+    ring = HashRing(4)
+    slices = [ring.select(URLS, shard) for shard in range(4)]
+
+    assert sorted(url for urls in slices for url in urls) == sorted(URLS)
+    assert all(len(urls) > 20 for urls in slices)
+
+
+def test_ring_moves_few_urls_when_shard_count_grows():
+    before, after = HashRing(4), HashRing(5)
+    moved = sum(1 for url in URLS if before.shard_for(url) != after.shard_for(url))
+
+    assert moved < len(URLS) * 0.35
+
+
+def test_spider_requests_and_state_are_shard_local(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    spiders = [ShardedSpider(shard_index=str(index), shard_count="3") for index in range(3)]
+
+    requested = [[request.url for request in spider.start_requests()] for spider in spiders]
+    assert sorted(url for urls in requested for url in urls) == sorted(URLS)
+    assert spiders[1].state_path == tmp_path / "sharded_watch" / "shard-1" / "cursor.json"
+    assert spiders[0].identity_index is not None
+    assert spiders[0].identity_index.path == tmp_path / "identity_index.sqlite3"
+    spiders[0].closed("finished")
+
+    with pytest.raises(ValueError):
+        ShardedSpider(shard_index=3, shard_count=3)
+
+
+def test_rebalance_moves_cursors_between_layouts(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    unsharded = ShardedSpider()
+    for index, url in enumerate(URLS):
+        unsharded._cursor_state[url] = Cursor(artifact_sha256=f"sha-{index}")
+    unsharded._save_state()
+
+    counts = rebalance(tmp_path / "sharded_watch", 4)
+    assert sum(counts.values()) == len(URLS)
+    assert json.loads(unsharded.state_path.read_text()) == {}
+
+    for index in range(4):
+        shard = ShardedSpider(shard_index=index, shard_count=4)
+        assert set(shard._cursor_state) == set(HashRing(4).select(URLS, index))
+
+    main(["sharded_watch", "--shards", "1", "--state-dir", str(tmp_path)])
+    merged = ShardedSpider()
+    assert len(merged._cursor_state) == len(URLS)
+    assert merged._cursor_state[URLS[7]].artifact_sha256 == "sha-7"
+
+
+def test_rebalance_keeps_page_cursors_with_their_watch(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    watches = [
+        PaginatedWatch(url=f"https://county-{index}.example.gov/list?page={{page}}", max_pages=5) for index in range(8)
+    ]
+
+    class PagedShardSpider(ShardedSpider):
+        paginated_watches = watches
+
+    unsharded = PagedShardSpider()
+    for watch in watches:
+        for page in range(1, 6):
+            unsharded._cursor_state[watch.page_url(page)] = Cursor(list_fingerprint=f"{watch.url}-{page}")
+    unsharded._save_state()
+
+    rebalance(tmp_path / "sharded_watch", 3, page_templates=[watch.url for watch in watches])
+
+    for index in range(3):
+        shard = PagedShardSpider(shard_index=index, shard_count=3)
+        owned = {request.cb_kwargs["run"].watch.url for request in shard.start_requests() if "run" in request.cb_kwargs}
+        expected = {watch.page_url(page) for watch in watches if watch.url in owned for page in range(1, 6)}
+        assert set(shard._cursor_state) == expected
+
+
+def test_rebalance_moves_yield_history_with_its_watch(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    unsharded = ShardedSpider()
+    for index, url in enumerate(URLS):
+        unsharded.yield_history.record(url, {"amounts": [{"type": "surplus", "amount": float(index)}]})
+    unsharded.yield_history.commit()
+
+    rebalance(tmp_path / "sharded_watch", 3)
+
+    for index in range(3):
+        shard = ShardedSpider(shard_index=index, shard_count=3)
+        owned = HashRing(3).select(URLS, index)
+        assert set(shard.yield_history.crawls) == set(owned)
+        assert shard.yield_history.crawls[owned[0]][0]["amount"] == float(URLS.index(owned[0]))
+    assert json.loads(unsharded.yield_history.path.read_text()) == {}
+
+
+def test_rebalance_merges_host_health_into_every_shard(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    shards = [ShardedSpider(shard_index=index, shard_count=2, host_failure_threshold=1) for index in range(2)]
+    shards[0].host_health.record_failure("county-1.example.gov", "HTTP 503")
+    shards[1].host_health.record_success("county-1.example.gov")
+    shards[1].host_health.record_success("county-2.example.gov")
+    for shard in shards:
+        shard.host_health.save()
+
+    rebalance(tmp_path / "sharded_watch", 3)
+
+    for index in range(3):
+        hosts = ShardedSpider(shard_index=index, shard_count=3).host_health.hosts
+        assert set(hosts) == {"county-1.example.gov", "county-2.example.gov"}
+        assert hosts["county-1.example.gov"].state == "open"
+
+    rebalance(tmp_path / "sharded_watch", 1)
+    assert ShardedSpider().host_health.hosts["county-1.example.gov"].state == "open"
+    assert json.loads(shards[1].host_health.path.read_text()) == {}
+
+
+def test_rebalance_to_one_shard_keeps_pending_spill_and_dead_letters(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    shards = [ShardedSpider(shard_index=index, shard_count=3) for index in range(3)]
+    SpillStore(shards[2].state_dir / "ingest_spill").write("sharded_watch", [{"n": 2}])
+    SpillStore(shards[0].state_dir / "ingest_spill").write("sharded_watch", [{"n": 0}])
+    for index in (1, 2):
+        shards[index].dead_letter_sink.write("sharded_watch", URLS[index], "bad row", {"n": index})
+        shards[index].dead_letter_sink.close()
+
+    rebalance(tmp_path / "sharded_watch", 1)
+
+    merged = ShardedSpider()
+    pending = SpillStore(merged.state_dir / "ingest_spill").pending()
+    assert sorted(SpillStore.load(path)[1][0]["n"] for path in pending) == [0, 2]
+    assert [entry["row"]["n"] for entry in read_dead_letters(merged.state_dir / "dead_letter.jsonl")] == [1, 2]
+    assert not list((tmp_path / "sharded_watch").glob("shard-*/ingest_spill/batch-*.json"))
+    assert not list((tmp_path / "sharded_watch").glob("shard-*/dead_letter.jsonl"))
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+
+from scrapy.http import Request, TextResponse
+
+from surplus_scraper.base import BaseSpider, Cursor
+from surplus_scraper.yield_history import YieldHistory
+
+RICH = "https://rich.example.test/list"
+QUIET = "https://quiet.example.test/list"
+NEW = "https://new.example.test/list"
+
+
+class YieldSpider(BaseSpider):
+    name = "yield_watch"
+    watch_urls = [QUIET, RICH]
+    identity_index_mode = "off"
+
+    def parse_records(self, response):
+        for index, amount in enumerate(json.loads(response.text)):
+            normalized_case = {
+                "case_ref": f"CASE-{index}",
+                "state": "TX",
+                "county_code": "201",
+                "source_system": "yield",
+                "filed_at": "2024-01-02",
+                "status": "open",
+                "amounts": [{"type": "surplus", "amount": amount}],
+            }
+            yield self.wrap_normalized_case(normalized_case, response)
+
+
+def build_response(url: str, amounts: list) -> TextResponse:
+    return TextResponse(url=url, body=json.dumps(amounts).encode(), encoding="utf-8", request=Request(url))
+
+
+def test_priorities_favour_recent_surplus_and_keep_new_urls_high(tmp_path):
+    history = YieldHistory(tmp_path / "yield_history.json", window=3)
+    for amounts in ([5000.0], [0.0], [12000.0, 800.0], [9000.0]):
+        history.touch(QUIET)
+        for amount in amounts:
+            history.record(RICH, {"amounts": [{"type": "surplus", "amount": amount}]})
+        history.commit()
+
+    assert len(history.crawls[RICH]) == 3
+    assert history.crawls[QUIET] == [{"items": 0, "amount": 0.0}] * 3
+
+    priorities = YieldHistory(tmp_path / "yield_history.json").priorities([QUIET, RICH, NEW])
+    assert priorities[QUIET] == 0
+    assert priorities[RICH] > 30
+    assert priorities[NEW] == priorities[RICH]
+
+
+def test_spider_records_yield_and_orders_next_crawl(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    spider = YieldSpider()
+    assert [request.url for request in spider.start_requests()] == [QUIET, RICH]
+
+    assert list(spider.parse_watch(build_response(QUIET, []), Cursor())) == []
+    assert len(list(spider.parse_watch(build_response(RICH, [1500.0, 250.5]), Cursor()))) == 2
+    spider.closed("finished")
+
+    saved = json.loads((tmp_path / spider.name / "yield_history.json").read_text())
+    assert saved[RICH] == [{"items": 2, "amount": 1750.5}]
+
+    requests = list(YieldSpider().start_requests())
+    assert [request.url for request in requests] == [RICH, QUIET]
+    assert requests[0].priority > requests[1].priority == 0
+
+
+def test_yield_priority_can_be_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCRAPER_STATE_DIR", str(tmp_path))
+    (tmp_path / YieldSpider.name).mkdir()
+    (tmp_path / YieldSpider.name / "yield_history.json").write_text(
+        json.dumps({RICH: [{"items": 4, "amount": 9000.0}]})
+    )
+    spider = YieldSpider(yield_priority=False)
+    requests = list(spider.start_requests())
+    assert [(request.url, request.priority) for request in requests] == [(QUIET, 0), (RICH, 0)]